@@ -1 +1,8 @@
-__all__ = ["knx_db_client", "knx_objects"]
+import logging
+
+__all__ = ["knx_db_client", "knx_objects", "bulk_report", "response_cache", "snapshot", "sync_plan",
+           "group_address_index", "group_address_table", "json_decoding", "instrumentation", "mock_server", "benchmark",
+           "resilience", "single_flight", "ets_import",
+           "write_behind", "query", "validation", "routing", "watch", "export"]
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
@@ -0,0 +1,4 @@
+import sys
+from knx_db_client.cli import main
+
+sys.exit(main())
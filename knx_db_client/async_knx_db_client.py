@@ -0,0 +1,456 @@
+import asyncio
+import aiohttp
+import json
+import logging
+from functools import partial
+from http import HTTPStatus
+from knx_db_client import knx_objects
+from knx_db_client import json_decoding
+from knx_db_client import resilience
+from knx_db_client.resilience import RetryPolicy, CircuitBreaker, DeadlineExceeded
+from knx_db_client.single_flight import AsyncSingleFlight
+from knx_db_client.knx_db_client import BASE_PATH, HEADER_CONTENT_TYPE, HEADER_ACCEPT, APPLICATION_JSON, HOST, PORT, \
+    POOL_SIZE, CONNECT_TIMEOUT, READ_TIMEOUT
+
+MAX_CONCURRENCY = 8
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncKnxDbClient:
+    def __init__(self, host: str = None, port: int = None, base_path: str = None, pool_size: int = None,
+                 connect_timeout: float = None, read_timeout: float = None, max_concurrency: int = None,
+                 retry_policy: RetryPolicy = None, circuit_breaker: CircuitBreaker = None, coalesce: bool = False):
+        if host:
+            self.host = host
+        else:
+            self.host = HOST
+        if port:
+            self.port = port
+        else:
+            self.port = PORT
+        if base_path:
+            self.base_path = base_path
+        else:
+            self.base_path = BASE_PATH
+        if pool_size:
+            self.pool_size = pool_size
+        else:
+            self.pool_size = POOL_SIZE
+        if connect_timeout:
+            self.connect_timeout = connect_timeout
+        else:
+            self.connect_timeout = CONNECT_TIMEOUT
+        if read_timeout:
+            self.read_timeout = read_timeout
+        else:
+            self.read_timeout = READ_TIMEOUT
+        if max_concurrency:
+            self.max_concurrency = max_concurrency
+        else:
+            self.max_concurrency = MAX_CONCURRENCY
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        if coalesce:
+            self.single_flight = AsyncSingleFlight()
+        else:
+            self.single_flight = None
+        self.url_start = f'http://{self.host}:{self.port}{self.base_path}'
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def get_project_list(self, filter_by_name: str = None) -> list:
+        try:
+            project_list = await self.__get_project_list_request(filter_by_name)
+            room_lists = await asyncio.gather(*[self.__get_room_list(project.get_project_id())
+                                                for project in project_list])
+            for project, room_list in zip(project_list, room_lists):
+                for room in room_list:
+                    project.add_room(room)
+            return project_list
+        except ValueError as err:
+            logger.error(f'Get project list failed: {err}')
+
+    async def get_room_list(self, project_id: int) -> list:
+        try:
+            return await self.__get_room_list(project_id)
+        except ValueError as err:
+            logger.error(f'Get room list failed: {err}')
+
+    async def get_device_list(self, room_id: int, project_id: int) -> list:
+        try:
+            return await self.__get_device_list(room_id, project_id)
+        except ValueError as err:
+            logger.error(f'Get device list failed: {err}')
+
+    async def get_group_address_list(self, device_id: int, room_id: int, project_id: int) -> list:
+        try:
+            return await self.__get_group_address_list_request(device_id, room_id, project_id)
+        except ValueError as err:
+            logger.error(f'Get group address list failed: {err}')
+
+    async def create_project(self, project_to_save: knx_objects.Project) -> knx_objects.Project:
+        if project_to_save is None:
+            raise ValueError('Project has no value!')
+        try:
+            project = await self.__create_project_request(project_to_save)
+            project_to_save.set_project_id(project.get_project_id())
+            await asyncio.gather(*[self.create_room(room_to_save) for room_to_save in project_to_save.get_rooms()])
+            return project_to_save
+        except ValueError as err:
+            logger.error(f'Saving project failed: {err}')
+
+    async def create_room(self, room_to_save: knx_objects.Room) -> knx_objects.Room:
+        if room_to_save is None:
+            raise ValueError('Room has no value!')
+        if room_to_save.get_project() is None:
+            raise ValueError('Room has no parent project!')
+        if room_to_save.get_project().get_project_id() is None:
+            raise ValueError('Parent project has no ID!')
+        try:
+            room = await self.__create_room_request(room_to_save, room_to_save.get_project().get_project_id())
+            room_to_save.set_room_id(room.get_room_id())
+            await asyncio.gather(*[self.create_device(device_to_save)
+                                   for device_to_save in room_to_save.get_devices()])
+            return room_to_save
+        except ValueError as err:
+            logger.error(f'Saving room failed: {err}')
+
+    async def create_device(self, device_to_save: knx_objects.Device) -> knx_objects.Device:
+        if device_to_save.get_room() is None:
+            raise ValueError('Device to save has no parent room')
+        if device_to_save.get_room().get_room_id() is None:
+            raise ValueError('Parent room has no room ID')
+        if device_to_save.get_room().get_project() is None:
+            raise ValueError('Room has no parent project!')
+        if device_to_save.get_room().get_project().get_project_id() is None:
+            raise ValueError('Parent project has no ID!')
+        try:
+            device = await self.__create_device_request(device_to_save, device_to_save.get_room().get_room_id(),
+                                                        device_to_save.get_room().get_project().get_project_id())
+            device_to_save.set_device_id(device.get_device_id())
+            await asyncio.gather(*[self.create_group_address(address_to_save)
+                                   for address_to_save in device_to_save.get_group_addresses()])
+            return device_to_save
+        except ValueError as err:
+            logger.error(f'Saving device failed: {err}')
+
+    async def create_group_address(self, address_to_save: knx_objects.GroupAddress) -> knx_objects.GroupAddress:
+        if address_to_save.get_device() is None:
+            raise ValueError('Group address has no parent device')
+        if address_to_save.get_device().get_device_id() is None:
+            raise ValueError('Parent device has no device ID')
+        if address_to_save.get_device().get_room() is None:
+            raise ValueError('Group Address has no parent room')
+        if address_to_save.get_device().get_room().get_room_id() is None:
+            raise ValueError('Parent room has no room ID')
+        if address_to_save.get_device().get_room().get_project() is None:
+            raise ValueError('Group Address has no parent project')
+        if address_to_save.get_device().get_room().get_project().get_project_id() is None:
+            raise ValueError('Parent project has no ID')
+        try:
+            device = address_to_save.get_device()
+            address = await self.__create_group_address_request(address_to_save,
+                                                                device.get_device_id(),
+                                                                device.get_room().get_room_id(),
+                                                                device.get_room().get_project().get_project_id())
+            address_to_save.set_group_address_id(address.get_group_address_id())
+            return address_to_save
+        except ValueError as err:
+            logger.error(f'Saving group address failed: {err}')
+
+    async def delete_project(self, project: knx_objects.Project):
+        room_list = await self.__get_room_list(project.get_project_id())
+        await asyncio.gather(*[self.__delete_room_tree(room, room.get_devices(), project.get_project_id())
+                               for room in room_list])
+        await self.__delete_project_request(project)
+
+    async def delete_room(self, room: knx_objects.Room, project_id: int):
+        # the subtree is fetched into separate objects, the caller's room may already have its devices loaded
+        device_list = await self.__get_device_list(room.get_room_id(), project_id)
+        await self.__delete_room_tree(room, device_list, project_id)
+
+    async def delete_device(self, device: knx_objects.Device, room_id: int, project_id: int):
+        address_list = await self.__get_group_address_list_request(device.get_device_id(), room_id, project_id)
+        await self.__delete_device_tree(device, address_list, room_id, project_id)
+
+    async def delete_group_address(self, address: knx_objects.GroupAddress, device_id: int, room_id: int,
+                                   project_id: int):
+        await self.__delete_group_address_request(address, device_id, room_id, project_id)
+
+    async def __delete_room_tree(self, room: knx_objects.Room, device_list: list, project_id: int):
+        await asyncio.gather(*[self.__delete_device_tree(device, device.get_group_addresses(), room.get_room_id(),
+                                                         project_id)
+                               for device in device_list])
+        await self.__delete_room_request(room, project_id)
+
+    async def __delete_device_tree(self, device: knx_objects.Device, address_list: list, room_id: int,
+                                   project_id: int):
+        await asyncio.gather(*[self.delete_group_address(address, device.get_device_id(), room_id, project_id)
+                               for address in address_list])
+        await self.__delete_device_request(device, room_id, project_id)
+
+    async def __get_room_list(self, project_id: int) -> list:
+        room_list = await self.__get_room_list_request(project_id)
+        device_lists = await asyncio.gather(*[self.__get_device_list(room.get_room_id(), project_id)
+                                              for room in room_list])
+        for room, device_list in zip(room_list, device_lists):
+            for device in device_list:
+                room.add_device(device)
+        return room_list
+
+    async def __get_device_list(self, room_id: int, project_id: int) -> list:
+        device_list = await self.__get_device_list_request(room_id, project_id)
+        address_lists = await asyncio.gather(*[self.__get_group_address_list_request(device.get_device_id(),
+                                                                                     room_id, project_id)
+                                               for device in device_list])
+        for device, address_list in zip(device_list, address_lists):
+            for address in address_list:
+                device.add_group_address(address)
+        return device_list
+
+    def __get_session(self) -> aiohttp.ClientSession:
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size),
+                timeout=aiohttp.ClientTimeout(sock_connect=self.connect_timeout, sock_read=self.read_timeout))
+        return self.session
+
+    async def __send(self, method: str, path: str, **kwargs) -> tuple:
+        if self.single_flight is None or method != 'GET':
+            return await self.__send_uncoalesced(method, path, **kwargs)
+        return await self.single_flight.do(path, partial(self.__send_uncoalesced, method, path, **kwargs))
+
+    async def __send_uncoalesced(self, method: str, path: str, **kwargs) -> tuple:
+        attempt = 0
+        while True:
+            active_deadline = resilience.current_deadline.get()
+            if active_deadline is not None:
+                active_deadline.check(f'{method} {path}')
+                kwargs['timeout'] = aiohttp.ClientTimeout(total=active_deadline.remaining(),
+                                                          sock_connect=self.connect_timeout,
+                                                          sock_read=self.read_timeout)
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.before_request()
+            try:
+                status, body = await self.__attempt(method, path, **kwargs)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.record_failure()
+                if active_deadline is not None and active_deadline.is_expired():
+                    raise DeadlineExceeded(f'{method} {path} exceeded its deadline of '
+                                           f'{active_deadline.get_timeout()} s') from err
+                if self.retry_policy is None or not self.retry_policy.can_retry(method, attempt):
+                    raise
+                logger.debug(f'{method} {path} failed on attempt {attempt + 1}, retrying: {err}')
+            else:
+                if self.circuit_breaker is not None:
+                    if status >= HTTPStatus.INTERNAL_SERVER_ERROR:
+                        self.circuit_breaker.record_failure()
+                    else:
+                        self.circuit_breaker.record_success()
+                if self.retry_policy is None or not self.retry_policy.is_retryable_status(status) \
+                        or not self.retry_policy.can_retry(method, attempt):
+                    return status, body
+                logger.debug(f'{method} {path} returned HTTP status [{status}] on attempt {attempt + 1}, retrying')
+            delay = self.retry_policy.get_delay(attempt)
+            if active_deadline is not None and delay >= active_deadline.remaining():
+                raise DeadlineExceeded(f'{method} {path} exceeded its deadline of {active_deadline.get_timeout()} s '
+                                       f'after {attempt + 1} attempt(s)')
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def __attempt(self, method: str, path: str, **kwargs) -> tuple:
+        async with self.semaphore:
+            async with self.__get_session().request(method, f'{self.url_start}{path}', **kwargs) as response:
+                return response.status, await response.read()
+
+    async def __create_project_request(self, project: knx_objects.Project) -> knx_objects.Project:
+        request_headers = {HEADER_CONTENT_TYPE: APPLICATION_JSON, HEADER_ACCEPT: APPLICATION_JSON}
+        status, body = await self.__send('POST', '/projects', data=json.dumps(project.get_data()),
+                                         headers=request_headers)
+        if status == HTTPStatus.CREATED:
+            logger.debug(f'Project [{project.get_name()}] saved')
+            return knx_objects.Project.project_decoder(json_decoding.loads(body))
+        else:
+            raise ValueError(f'Create project returned HTTP status [{status}], error: {body.decode(errors="replace")}')
+
+    async def __get_project_list_request(self, filter_by_name: str = None) -> list:
+        request_headers = {HEADER_ACCEPT: APPLICATION_JSON}
+        path = '/projects'
+        if filter_by_name is not None:
+            path = path + f'?name={filter_by_name}'
+        status, body = await self.__send('GET', path, headers=request_headers)
+        if status == HTTPStatus.OK:
+            logger.debug('Project list retrieved')
+            return knx_objects.Project.project_list_decoder(json_decoding.loads(body))
+        else:
+            raise ValueError(
+                f'Get project list returned HTTP status [{status}], error: {body.decode(errors="replace")}')
+
+    async def __delete_project_request(self, project: knx_objects.Project) -> bool:
+        if project.get_project_id() is None:
+            raise ValueError('Unable to delete project: project has no ID')
+        request_headers = {HEADER_ACCEPT: APPLICATION_JSON}
+        status, body = await self.__send('DELETE', f'/projects/{project.get_project_id()}',
+                                         headers=request_headers)
+        if status == HTTPStatus.OK:
+            logger.debug(f'Project [{project.get_name()}] deleted')
+            return True
+        else:
+            logger.error(f'Delete project returned HTTP status [{status}] and error: {body.decode(errors="replace")}')
+            return False
+
+    async def __create_room_request(self, room: knx_objects.Room, project_id: int) -> knx_objects.Room:
+        if project_id is None:
+            raise ValueError('Unable to add room: invalid parent project ID')
+        request_headers = {HEADER_CONTENT_TYPE: APPLICATION_JSON, HEADER_ACCEPT: APPLICATION_JSON}
+        status, body = await self.__send('POST', f'/projects/{project_id}/rooms',
+                                         data=json.dumps(room.get_data()), headers=request_headers)
+        if status == HTTPStatus.CREATED:
+            logger.debug(f'Room [{room.get_name()}] added to project with ID [{project_id}]')
+            return knx_objects.Room.room_decoder(json_decoding.loads(body))
+        else:
+            raise ValueError(f'Create room returned HTTP status [{status}] and error: {body.decode(errors="replace")}')
+
+    async def __delete_room_request(self, room: knx_objects.Room, project_id: int) -> bool:
+        if room.get_room_id() is None:
+            raise ValueError('Unable to delete room: room has no ID')
+        if project_id is None:
+            raise ValueError('Unable to delete room: invalid parent project ID')
+        request_headers = {HEADER_ACCEPT: APPLICATION_JSON}
+        status, body = await self.__send(
+            'DELETE', f'/projects/{project_id}/rooms/{room.get_room_id()}',
+            headers=request_headers)
+        if status == HTTPStatus.OK:
+            logger.debug(f'Room [{room.get_name()}] deleted')
+            return True
+        else:
+            logger.error(f'Delete room returned HTTP status [{status}] and error: {body.decode(errors="replace")}')
+            return False
+
+    async def __create_device_request(self, device: knx_objects.Device, room_id: int,
+                                      project_id: int) -> knx_objects.Device:
+        if room_id is None:
+            raise ValueError('Unable to save device: invalid parent room ID')
+        if project_id is None:
+            raise ValueError('Unable to save device: invalid parent project ID')
+        request_headers = {HEADER_CONTENT_TYPE: APPLICATION_JSON, HEADER_ACCEPT: APPLICATION_JSON}
+        status, body = await self.__send(
+            'POST', f'/projects/{project_id}/rooms/{room_id}/devices',
+            data=json.dumps(device.get_data()), headers=request_headers)
+        if status == HTTPStatus.CREATED:
+            logger.debug(f'Device [{device.get_label()}] added to room with ID [{room_id}]')
+            return knx_objects.Device.device_decoder(json_decoding.loads(body))
+        else:
+            raise ValueError(f'Create device returned HTTP status [{status}], error: {body.decode(errors="replace")}')
+
+    async def __delete_device_request(self, device: knx_objects.Device, room_id: int, project_id: int) -> bool:
+        if room_id is None:
+            raise ValueError('Unable to delete device: invalid parent room ID')
+        if project_id is None:
+            raise ValueError('Unable to delete device: invalid parent project ID')
+        request_headers = {HEADER_ACCEPT: APPLICATION_JSON}
+        status, body = await self.__send(
+            'DELETE', f'/projects/{project_id}/rooms/{room_id}/devices/{device.get_device_id()}',
+            headers=request_headers)
+        if status == HTTPStatus.OK:
+            logger.debug(f'Device {device.get_label()} deleted')
+            return True
+        else:
+            logger.error(f'Delete device returned HTTP status [{status}] and error: {body.decode(errors="replace")}')
+            return False
+
+    async def __create_group_address_request(self, address: knx_objects.GroupAddress, device_id: int,
+                                             room_id: int, project_id: int) -> knx_objects.GroupAddress:
+        if device_id is None:
+            raise ValueError('Unable to save group address: invalid parent device ID')
+        if room_id is None:
+            raise ValueError('Unable to save group address: invalid parent room ID')
+        if project_id is None:
+            raise ValueError('Unable to save group address: invalid parent project ID')
+        request_headers = {HEADER_CONTENT_TYPE: APPLICATION_JSON, HEADER_ACCEPT: APPLICATION_JSON}
+        status, body = await self.__send(
+            'POST', f'/projects/{project_id}/rooms/{room_id}/devices/{device_id}/group-addresses',
+            data=json.dumps(address.get_data()), headers=request_headers)
+        if status == HTTPStatus.CREATED:
+            logger.debug(f'Group address [{address.get_address()}] added to device with ID [{device_id}]')
+            return knx_objects.GroupAddress.group_address_decoder(json_decoding.loads(body))
+        else:
+            raise ValueError(
+                f'Create group address returned HTTP status [{status}], error: {body.decode(errors="replace")}')
+
+    async def __delete_group_address_request(self, address: knx_objects.GroupAddress, device_id: int, room_id: int,
+                                             project_id: int) -> bool:
+        if device_id is None:
+            raise ValueError('Unable to delete group address: invalid parent device ID')
+        if room_id is None:
+            raise ValueError('Unable to delete group address: invalid parent room ID')
+        if project_id is None:
+            raise ValueError('Unable to delete group address: invalid parent project ID')
+        request_headers = {HEADER_ACCEPT: APPLICATION_JSON}
+        device_path = f'devices/{device_id}/group-addresses/{address.get_group_address_id()}'
+        status, body = await self.__send(
+            'DELETE', f'/projects/{project_id}/rooms/{room_id}/{device_path}',
+            headers=request_headers)
+        if status == HTTPStatus.OK:
+            logger.debug(f'Group address {address.get_address()} deleted')
+            return True
+        else:
+            logger.error(
+                f'Delete group address returned HTTP status [{status}] and error: {body.decode(errors="replace")}')
+            return False
+
+    async def __get_room_list_request(self, project_id: int) -> list:
+        if project_id is None:
+            raise ValueError('Unable to retrieve room list: invalid project ID')
+        request_headers = {HEADER_ACCEPT: APPLICATION_JSON}
+        status, body = await self.__send('GET', f'/projects/{project_id}/rooms', headers=request_headers)
+        if status == HTTPStatus.OK:
+            logger.debug('Rooms list retrieved')
+            return knx_objects.Room.room_list_decoder(json_decoding.loads(body))
+        else:
+            raise ValueError(f'Get room list returned HTTP status [{status}], error: {body.decode(errors="replace")}')
+
+    async def __get_device_list_request(self, room_id: int, project_id: int) -> list:
+        if room_id is None:
+            raise ValueError('Unable to retrieve device list: invalid room ID')
+        if project_id is None:
+            raise ValueError('Unable to retrieve device list: invalid project ID')
+        request_headers = {HEADER_ACCEPT: APPLICATION_JSON}
+        status, body = await self.__send('GET', f'/projects/{project_id}/rooms/{room_id}/devices',
+                                         headers=request_headers)
+        if status == HTTPStatus.OK:
+            logger.debug('Device list retrieved')
+            return knx_objects.Device.device_list_decoder(json_decoding.loads(body))
+        else:
+            raise ValueError(f'Get device list returned HTTP status [{status}], error: {body.decode(errors="replace")}')
+
+    async def __get_group_address_list_request(self, device_id: int, room_id: int, project_id: int) -> list:
+        if device_id is None:
+            raise ValueError('Unable to retrieve group address list: invalid device ID')
+        if room_id is None:
+            raise ValueError('Unable to retrieve group address list: invalid room ID')
+        if project_id is None:
+            raise ValueError('Unable to retrieve group address list: invalid project ID')
+        request_headers = {HEADER_ACCEPT: APPLICATION_JSON}
+        status, body = await self.__send(
+            'GET', f'/projects/{project_id}/rooms/{room_id}/devices/{device_id}/group-addresses',
+            headers=request_headers)
+        if status == HTTPStatus.OK:
+            logger.debug('Group address list retrieved')
+            return knx_objects.GroupAddress.group_address_list_decoder(json_decoding.loads(body))
+        else:
+            raise ValueError(
+                f'Get group address list returned HTTP status [{status}], error: {body.decode(errors="replace")}')
@@ -0,0 +1,204 @@
+import argparse
+import gc
+import json
+import math
+import sys
+import time
+import tracemalloc
+from knx_db_client import knx_objects
+from knx_db_client.knx_db_client import KnxDbClient
+from knx_db_client.mock_server import MockKnxDbServer
+from knx_db_client.group_address_index import unpack_group_address
+
+SIZES = (10, 1000, 100000)
+ADDRESSES_PER_DEVICE = 10
+DEVICES_PER_ROOM = 10
+ADDRESSES_PER_PROJECT = 50000
+BENCHMARKS = ('get_project_list', 'get_project_list_lazy', 'get_group_address_list', 'create_project',
+              'bulk_create_project', 'delete_project')
+
+
+def build_project(name: str, group_addresses: int) -> knx_objects.Project:
+    project = knx_objects.Project(name)
+    device_count = math.ceil(group_addresses / ADDRESSES_PER_DEVICE)
+    room = None
+    for device_number in range(device_count):
+        if device_number % DEVICES_PER_ROOM == 0:
+            room_number = device_number // DEVICES_PER_ROOM
+            room = knx_objects.Room(f'Room {room_number}', f'R{room_number}', 'EG')
+            project.add_room(room)
+        device = knx_objects.Device(f'Device {device_number}', 'switch')
+        room.add_device(device)
+        first = device_number * ADDRESSES_PER_DEVICE
+        for packed in range(first, min(first + ADDRESSES_PER_DEVICE, group_addresses)):
+            main_group, middle_group, sub_group = unpack_group_address(packed)
+            device.add_group_address(knx_objects.GroupAddress(main_group, middle_group, sub_group, 'switch', '1.001'))
+    return project
+
+
+def build_projects(group_addresses: int) -> list:
+    result = []
+    remaining = group_addresses
+    while remaining > 0 or not result:
+        size = min(remaining, ADDRESSES_PER_PROJECT)
+        result.append(build_project(f'Benchmark {len(result)}', size))
+        remaining -= size
+    return result
+
+
+class BenchmarkResult:
+    def __init__(self, name: str, group_addresses: int, requests: int, wall_time: float, peak_memory: int,
+                 workers: int, latency: float):
+        self.name = name
+        self.group_addresses = group_addresses
+        self.requests = requests
+        self.wall_time = wall_time
+        self.peak_memory = peak_memory
+        self.workers = workers
+        self.latency = latency
+
+    def get_name(self) -> str:
+        return self.name
+
+    def get_group_addresses(self) -> int:
+        return self.group_addresses
+
+    def get_requests(self) -> int:
+        return self.requests
+
+    def get_wall_time(self) -> float:
+        return self.wall_time
+
+    def get_peak_memory(self) -> int:
+        return self.peak_memory
+
+    def get_data(self) -> dict:
+        return {'benchmark': self.name, 'group_addresses': self.group_addresses, 'requests': self.requests,
+                'wall_seconds': round(self.wall_time, 6), 'peak_memory_bytes': self.peak_memory,
+                'workers': self.workers, 'latency_seconds': self.latency}
+
+    def __str__(self):
+        peak = f'{self.peak_memory / 1024 / 1024:.1f} MiB' if self.peak_memory is not None else 'n/a'
+        return (f'{self.name:<24} {self.group_addresses:>8} GAs {self.requests:>8} requests '
+                f'{self.wall_time:>9.3f} s  peak {peak}')
+
+
+class Benchmark:
+    def __init__(self, latency: float = 0.0, workers: int = None, trace_memory: bool = True):
+        self.latency = latency
+        self.workers = workers
+        self.trace_memory = trace_memory
+
+    def run(self, name: str, group_addresses: int) -> BenchmarkResult:
+        if name not in BENCHMARKS:
+            raise ValueError(f'Unknown benchmark: {name}')
+        with MockKnxDbServer(latency=self.latency) as server:
+            with KnxDbClient(host=server.get_host(), port=server.get_port(), max_workers=self.workers) as client:
+                preparers = {'get_project_list': self.__prepare_get_project_list,
+                             'get_project_list_lazy': self.__prepare_get_project_list_lazy,
+                             'get_group_address_list': self.__prepare_get_group_address_list,
+                             'create_project': self.__prepare_create_project,
+                             'bulk_create_project': self.__prepare_bulk_create_project,
+                             'delete_project': self.__prepare_delete_project}
+                operation = preparers[name](server, client, group_addresses)
+                return self.__measure(name, group_addresses, server, operation)
+
+    def run_all(self, names=BENCHMARKS, sizes=SIZES, progress=None) -> list:
+        result = []
+        for size in sizes:
+            for name in names:
+                benchmark_result = self.run(name, size)
+                if progress is not None:
+                    progress(benchmark_result)
+                result.append(benchmark_result)
+        return result
+
+    def __measure(self, name: str, group_addresses: int, server: MockKnxDbServer, operation) -> BenchmarkResult:
+        gc.collect()
+        if self.trace_memory:
+            tracemalloc.start()
+        requests_before = server.get_request_count()
+        started = time.perf_counter()
+        try:
+            operation()
+            wall_time = time.perf_counter() - started
+            peak_memory = tracemalloc.get_traced_memory()[1] if self.trace_memory else None
+        finally:
+            if self.trace_memory:
+                tracemalloc.stop()
+        return BenchmarkResult(name, group_addresses, server.get_request_count() - requests_before, wall_time,
+                               peak_memory, self.workers, self.latency)
+
+    @staticmethod
+    def __populate(server: MockKnxDbServer, group_addresses: int) -> list:
+        projects = build_projects(group_addresses)
+        for project in projects:
+            server.get_store().add_project(project)
+        return projects
+
+    def __prepare_get_project_list(self, server: MockKnxDbServer, client: KnxDbClient, group_addresses: int):
+        self.__populate(server, group_addresses)
+        return client.get_project_list
+
+    def __prepare_get_project_list_lazy(self, server: MockKnxDbServer, client: KnxDbClient, group_addresses: int):
+        self.__populate(server, group_addresses)
+        return lambda: client.get_project_list(lazy=True)
+
+    def __prepare_get_group_address_list(self, server: MockKnxDbServer, client: KnxDbClient, group_addresses: int):
+        project = self.__populate(server, group_addresses)[0]
+        room = project.get_rooms()[0]
+        device = room.get_devices()[0]
+        return lambda: client.get_group_address_list(device.get_device_id(), room.get_room_id(),
+                                                     project.get_project_id())
+
+    @staticmethod
+    def __prepare_create_project(server: MockKnxDbServer, client: KnxDbClient, group_addresses: int):
+        projects = build_projects(group_addresses)
+        return lambda: [client.create_project(project) for project in projects]
+
+    @staticmethod
+    def __prepare_bulk_create_project(server: MockKnxDbServer, client: KnxDbClient, group_addresses: int):
+        projects = build_projects(group_addresses)
+
+        def operation():
+            for project in projects:
+                report = client.bulk_create_project(project)
+                if report.has_failures():
+                    raise ValueError(f'Bulk create failed: {report}')
+        return operation
+
+    def __prepare_delete_project(self, server: MockKnxDbServer, client: KnxDbClient, group_addresses: int):
+        projects = self.__populate(server, group_addresses)
+
+        def operation():
+            for project in projects:
+                report = client.delete_project(project)
+                if report.has_failures():
+                    raise ValueError(f'Delete failed: {report}')
+        return operation
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark knx-db-client against a local mock knx-db server')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(SIZES),
+                        help='number of group addresses per run')
+    parser.add_argument('--benchmarks', nargs='+', choices=BENCHMARKS, default=list(BENCHMARKS))
+    parser.add_argument('--latency', type=float, default=0.0, help='simulated server latency in seconds')
+    parser.add_argument('--workers', type=int, default=None, help='client worker threads')
+    parser.add_argument('--no-memory', action='store_true', help='skip tracemalloc peak memory tracking')
+    parser.add_argument('--output', help='write JSON results to this file instead of stdout')
+    args = parser.parse_args(argv)
+    benchmark = Benchmark(args.latency, args.workers, not args.no_memory)
+    results = benchmark.run_all(args.benchmarks, args.sizes, progress=lambda result: print(result, file=sys.stderr))
+    data = {'python': sys.version.split()[0], 'results': [result.get_data() for result in results]}
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(data, output, indent=2)
+    else:
+        json.dump(data, sys.stdout, indent=2)
+        print()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,73 @@
+import threading
+from knx_db_client import knx_objects
+
+
+def get_node_id(node) -> int:
+    if isinstance(node, knx_objects.Project):
+        return node.get_project_id()
+    if isinstance(node, knx_objects.Room):
+        return node.get_room_id()
+    if isinstance(node, knx_objects.Device):
+        return node.get_device_id()
+    if isinstance(node, knx_objects.GroupAddress):
+        return node.get_group_address_id()
+    raise ValueError(f'Unsupported node type [{type(node).__name__}]')
+
+
+class BulkFailure:
+    def __init__(self, node, error: str):
+        self.node = node
+        self.error = error
+
+    def get_node(self):
+        return self.node
+
+    def get_error(self) -> str:
+        return self.error
+
+    def __repr__(self):
+        return f'BulkFailure({type(self.node).__name__}, {self.error!r})'
+
+
+class BulkReport:
+    def __init__(self, total: int = None, progress=None):
+        self.succeeded = []
+        self.failures = []
+        self.total = total
+        self.progress = progress
+        self.lock = threading.Lock()
+
+    def add_success(self, node) -> None:
+        with self.lock:
+            self.succeeded.append(node)
+            processed = len(self.succeeded) + len(self.failures)
+        if self.progress is not None:
+            self.progress(processed, self.total)
+
+    def add_failure(self, node, error: str) -> None:
+        with self.lock:
+            self.failures.append(BulkFailure(node, error))
+            processed = len(self.succeeded) + len(self.failures)
+        if self.progress is not None:
+            self.progress(processed, self.total)
+
+    def get_total(self) -> int:
+        return self.total
+
+    def get_succeeded(self) -> list:
+        return self.succeeded
+
+    def get_failures(self) -> list:
+        return self.failures
+
+    def has_failures(self) -> bool:
+        return len(self.failures) > 0
+
+    def get_ids(self) -> dict:
+        result = {}
+        for node in self.succeeded:
+            result.setdefault(type(node).__name__, []).append(get_node_id(node))
+        return result
+
+    def __repr__(self):
+        return f'BulkReport(succeeded={len(self.succeeded)}, failures={len(self.failures)})'
@@ -0,0 +1,252 @@
+import argparse
+import logging
+import os
+import sys
+
+TEXT = 'text'
+NDJSON = 'ndjson'
+JSON = 'json'
+FORMATS = (TEXT, NDJSON, JSON)
+
+
+def main(argv: list = None) -> int:
+    parser = _build_parser()
+    args, extra = parser.parse_known_args(argv)
+    if args.command != 'bench' and extra:
+        parser.error(f'unrecognized arguments: {" ".join(extra)}')
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING,
+                        format='%(levelname)s %(name)s: %(message)s')
+    if args.command == 'bench':
+        from knx_db_client import benchmark
+        if args.workers:
+            extra = ['--workers', str(args.workers)] + extra
+        return benchmark.main(extra)
+    try:
+        return args.handler(args)
+    except BrokenPipeError:
+        return 0
+    except (ValueError, OSError) as err:
+        # requests exceptions derive from OSError, scripts get a one-line error instead of a traceback
+        print(f'knx-db: {err}', file=sys.stderr)
+        return 1
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='knx-db', description='Command-line client for knx-db')
+    parser.add_argument('--host', help='knx-db host name')
+    parser.add_argument('--port', type=int, help='knx-db port')
+    parser.add_argument('--base-path', help='knx-db base path')
+    parser.add_argument('--workers', type=int, help='number of concurrent requests')
+    parser.add_argument('--cache', action='store_true', help='cache GET responses for the duration of the command')
+    parser.add_argument('--timeout', type=float, help='deadline in seconds for each client operation')
+    parser.add_argument('--format', choices=FORMATS, default=TEXT,
+                        help='output format, streamed commands write json as ndjson')
+    parser.add_argument('-v', '--verbose', action='store_true', help='log requests and client diagnostics')
+    commands = parser.add_subparsers(dest='command', metavar='command', required=True)
+
+    list_parser = commands.add_parser('list', help='list projects')
+    list_parser.add_argument('--name', help='only list projects with this name')
+    list_parser.set_defaults(handler=_list)
+
+    dump_parser = commands.add_parser('dump', help='print the tree of a project')
+    dump_parser.add_argument('project', help='project ID or name')
+    dump_parser.set_defaults(handler=_dump)
+
+    export_parser = commands.add_parser('export', help='export a project to a snapshot or data file')
+    export_parser.add_argument('project', help='project ID or name')
+    export_parser.add_argument('output', help='file to write, .ndjson, .csv, .parquet and .arrow are streamed, '
+                                              'any other name is written as a snapshot')
+    export_parser.set_defaults(handler=_export)
+
+    import_parser = commands.add_parser('import', help='create a project from a snapshot or an ETS export')
+    import_parser.add_argument('input', help='snapshot, .knxproj, group address .xml or .csv file')
+    import_parser.add_argument('--name', help='project name, defaults to the name in the file')
+    import_parser.set_defaults(handler=_import)
+
+    sync_parser = commands.add_parser('sync', help='bring a project on knx-db in line with a local file')
+    sync_parser.add_argument('input', help='snapshot, .knxproj, group address .xml or .csv file')
+    sync_parser.add_argument('--name', help='project name, defaults to the name in the file')
+    sync_parser.add_argument('--dry-run', action='store_true', help='only print the planned changes')
+    sync_parser.set_defaults(handler=_sync)
+
+    delete_parser = commands.add_parser('delete', help='delete a project and everything below it')
+    delete_parser.add_argument('project', help='project ID or name')
+    delete_parser.set_defaults(handler=_delete)
+
+    commands.add_parser('bench', help='run the benchmark suite against a local mock server', add_help=False)
+    return parser
+
+
+def _create_client(args):
+    from knx_db_client.knx_db_client import KnxDbClient
+    cache = None
+    if args.cache:
+        from knx_db_client.response_cache import ResponseCache
+        cache = ResponseCache()
+    return KnxDbClient(host=args.host, port=args.port, base_path=args.base_path, max_workers=args.workers,
+                       cache=cache, operation_timeout=args.timeout)
+
+
+def _find_project(client, project: str):
+    if project.isdigit():
+        projects = [candidate for candidate in _get_projects(client)
+                    if candidate.get_project_id() == int(project)]
+    else:
+        projects = _get_projects(client, project)
+    if not projects:
+        raise ValueError(f'Project [{project}] not found')
+    if len(projects) > 1:
+        raise ValueError(f'Project name [{project}] is ambiguous, use the project ID')
+    return projects[0]
+
+
+def _get_projects(client, name: str = None) -> list:
+    projects = client.get_project_list(name, lazy=True)
+    if projects is None:
+        raise ValueError('Retrieving the project list failed')
+    return projects
+
+
+def _read_project(path: str, name: str = None):
+    from knx_db_client import snapshot
+    with open(path, 'rb') as input_file:
+        is_snapshot = input_file.read(len(snapshot.MAGIC)) == snapshot.MAGIC
+    if is_snapshot:
+        project = snapshot.load_snapshot(path)
+        if name:
+            # a renamed snapshot is a different project, so it is matched by name instead of its stored ID
+            project.name = name
+            project.set_project_id(None)
+        return project
+    from knx_db_client import ets_import
+    return ets_import.read_ets_export(path, name)
+
+
+def _write(args, record_type: str, node, depth: int = 0, **parent_ids) -> None:
+    if args.format == TEXT:
+        if record_type == 'project':
+            text = f'{node.get_project_id()}\t{node.get_name()}'
+        elif record_type == 'room':
+            text = f'{node.get_room_id()}\t{node.get_name()}'
+        elif record_type == 'device':
+            text = f'{node.get_device_id()}\t{node.get_label()}'
+        else:
+            text = f'{node.get_group_address_id()}\t{node.get_address()}\t{node.get_function() or ""}'
+        sys.stdout.write('  ' * depth + text + '\n')
+        return
+    import json
+    record = {'type': record_type}
+    record.update(parent_ids)
+    record.update(node.get_data())
+    sys.stdout.write(json.dumps(record, separators=(',', ':')) + '\n')
+
+
+def _list(args) -> int:
+    with _create_client(args) as client:
+        projects = _get_projects(client, args.name)
+    if args.format == JSON:
+        import json
+        json.dump([project.get_data() for project in projects], sys.stdout, indent=2)
+        sys.stdout.write('\n')
+        return 0
+    for project in projects:
+        _write(args, 'project', project)
+    return 0
+
+
+def _dump(args) -> int:
+    with _create_client(args) as client:
+        project = _find_project(client, args.project)
+        project_id = project.get_project_id()
+        _write(args, 'project', project)
+        for room in client.iter_rooms(project_id):
+            room_id = room.get_room_id()
+            _write(args, 'room', room, 1, projectid=project_id)
+            for device in room.get_devices():
+                _write(args, 'device', device, 2, projectid=project_id, roomid=room_id)
+                for address in device.get_group_addresses():
+                    _write(args, 'group_address', address, 3, projectid=project_id, roomid=room_id,
+                           deviceid=device.get_device_id())
+            sys.stdout.flush()
+    return 0
+
+
+def _export(args) -> int:
+    from knx_db_client import export
+    from knx_db_client import snapshot
+    with _create_client(args) as client:
+        project = _find_project(client, args.project)
+        if os.path.splitext(args.output)[1].lower() in export.EXTENSIONS:
+            export.export_project(client, project, args.output)
+            return 0
+        fingerprint = client.get_project_fingerprint(project.get_project_id())
+        project.set_rooms_loader(None)
+        for room in client.iter_rooms(project.get_project_id()):
+            project.add_room(room)
+    snapshot.save_snapshot(project, args.output, fingerprint)
+    return 0
+
+
+def _import(args) -> int:
+    from knx_db_client import sync_plan
+    project = _read_project(args.input, args.name)
+    sync_plan.clear_node_ids(project)
+    progress = _Progress(args)
+    with _create_client(args) as client:
+        report = client.bulk_create_project(project, progress)
+    progress.finish()
+    return _print_report(args, report)
+
+
+def _sync(args) -> int:
+    project = _read_project(args.input, args.name)
+    with _create_client(args) as client:
+        if args.dry_run:
+            plan = client.plan_sync(project)
+        else:
+            plan = client.sync_project(project)
+    print(plan)
+    if plan.get_report() is None:
+        return 0
+    return _print_report(args, plan.get_report())
+
+
+def _delete(args) -> int:
+    with _create_client(args) as client:
+        project = _find_project(client, args.project)
+        report = client.delete_project(project)
+    return _print_report(args, report)
+
+
+def _print_report(args, report) -> int:
+    for failure in report.get_failures():
+        print(f'failed: {type(failure.get_node()).__name__} {failure.get_error()}', file=sys.stderr)
+    if args.format == TEXT:
+        print(f'{len(report.get_succeeded())} succeeded, {len(report.get_failures())} failed')
+    else:
+        import json
+        print(json.dumps({'succeeded': len(report.get_succeeded()), 'failed': len(report.get_failures())}))
+    return 1 if report.has_failures() else 0
+
+
+class _Progress:
+    def __init__(self, args):
+        self.enabled = sys.stderr.isatty() and not args.verbose
+        self.last_percent = -1
+
+    def __call__(self, processed: int, total: int) -> None:
+        if not self.enabled or not total:
+            return
+        percent = processed * 100 // total
+        if percent != self.last_percent:
+            self.last_percent = percent
+            sys.stderr.write(f'\r{processed}/{total} ({percent}%)')
+            sys.stderr.flush()
+
+    def finish(self) -> None:
+        if self.enabled and self.last_percent >= 0:
+            sys.stderr.write('\n')
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,189 @@
+import csv
+import io
+import os
+import re
+import zipfile
+import xml.etree.ElementTree as ElementTree
+from knx_db_client import knx_objects
+from knx_db_client.bulk_report import BulkReport
+from knx_db_client.group_address_index import unpack_group_address
+
+DEVICE_TYPE = 'group range'
+INSTALLATION_FILE = re.compile(r'^P-[0-9A-F]+/0\.xml$', re.IGNORECASE)
+PROJECT_FILE = re.compile(r'^P-[0-9A-F]+/project\.xml$', re.IGNORECASE)
+NESTED_PROJECT = re.compile(r'^P-[0-9A-F]+\.zip$', re.IGNORECASE)
+DATAPOINT_TYPE = re.compile(r'^DPS?T-(\d+)(?:-(\d+))?$')
+CSV_ADDRESS = re.compile(r'^(\d+)/(\d+|-)/(\d+|-)$')
+CSV_DELIMITERS = ',;\t'
+
+
+def get_data_type(datapoint_types: str) -> str:
+    if not datapoint_types:
+        return None
+    match = DATAPOINT_TYPE.match(datapoint_types.split()[0].split(',')[0].strip())
+    if match is None:
+        return None
+    if match.group(2) is None:
+        return match.group(1)
+    return f'{match.group(1)}.{int(match.group(2)):03d}'
+
+
+class EtsProjectBuilder:
+    def __init__(self, name: str):
+        self.project = knx_objects.Project(name)
+        self.rooms = {}
+        self.devices = {}
+        self.group_address_count = 0
+
+    def add_main_range(self, main_group: int, name: str) -> knx_objects.Room:
+        room = self.rooms.get(main_group)
+        if room is None:
+            room = knx_objects.Room(name or f'Main group {main_group}', str(main_group))
+            self.project.add_room(room)
+            self.rooms[main_group] = room
+        elif name:
+            room.name = name
+        return room
+
+    def add_middle_range(self, main_group: int, middle_group: int, name: str) -> knx_objects.Device:
+        device = self.devices.get((main_group, middle_group))
+        if device is None:
+            device = knx_objects.Device(name or f'Middle group {main_group}/{middle_group}', DEVICE_TYPE)
+            self.add_main_range(main_group, None).add_device(device)
+            self.devices[(main_group, middle_group)] = device
+        elif name:
+            device.label = name
+        return device
+
+    def add_group_address(self, main_group: int, middle_group: int, sub_group: int, name: str = None,
+                          data_type: str = None) -> knx_objects.GroupAddress:
+        group_address = knx_objects.GroupAddress(main_group, middle_group, sub_group, name, data_type)
+        self.add_middle_range(main_group, middle_group, None).add_group_address(group_address)
+        self.group_address_count += 1
+        return group_address
+
+    def get_project(self) -> knx_objects.Project:
+        return self.project
+
+    def get_group_address_count(self) -> int:
+        return self.group_address_count
+
+
+def read_knxproj(path: str, name: str = None) -> knx_objects.Project:
+    with zipfile.ZipFile(path) as archive:
+        names = archive.namelist()
+        installation = next((entry for entry in names if INSTALLATION_FILE.match(entry)), None)
+        if installation is None:
+            nested = next((entry for entry in names if NESTED_PROJECT.match(entry)), None)
+            if nested is None:
+                raise ValueError(f'No ETS project installation found in [{path}]')
+            try:
+                with archive.open(nested) as nested_file:
+                    return read_knxproj(io.BytesIO(nested_file.read()), name)
+            except RuntimeError as err:
+                raise ValueError(f'Password protected ETS projects are not supported: {err}') from err
+        if name is None:
+            project_file = next((entry for entry in names if PROJECT_FILE.match(entry)), None)
+            if project_file is not None:
+                with archive.open(project_file) as xml_file:
+                    name = _read_project_name(xml_file)
+        builder = EtsProjectBuilder(name or _get_default_name(path))
+        with archive.open(installation) as xml_file:
+            _read_group_ranges(xml_file, builder, packed_addresses=True)
+        return builder.get_project()
+
+
+def read_group_address_xml(path: str, name: str = None) -> knx_objects.Project:
+    builder = EtsProjectBuilder(name or _get_default_name(path))
+    with open(path, 'rb') as xml_file:
+        _read_group_ranges(xml_file, builder, packed_addresses=False)
+    return builder.get_project()
+
+
+def read_group_address_csv(path: str, name: str = None, encoding: str = 'utf-8-sig') -> knx_objects.Project:
+    builder = EtsProjectBuilder(name or _get_default_name(path))
+    with open(path, newline='', encoding=encoding) as csv_file:
+        sample = csv_file.read(4096)
+        csv_file.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=CSV_DELIMITERS)
+        except csv.Error:
+            dialect = csv.excel
+        for row in csv.DictReader(csv_file, dialect=dialect):
+            match = CSV_ADDRESS.match((row.get('Address') or '').strip())
+            if match is None:
+                continue
+            row_name = row.get('Group name') or row.get('Sub') or row.get('Middle') or row.get('Main')
+            main_group = int(match.group(1))
+            if match.group(2) == '-':
+                builder.add_main_range(main_group, row_name)
+            elif match.group(3) == '-':
+                builder.add_middle_range(main_group, int(match.group(2)), row_name)
+            else:
+                builder.add_group_address(main_group, int(match.group(2)), int(match.group(3)), row_name,
+                                          get_data_type(row.get('DatapointType')))
+    return builder.get_project()
+
+
+def read_ets_export(path: str, name: str = None) -> knx_objects.Project:
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.knxproj':
+        return read_knxproj(path, name)
+    if extension == '.xml':
+        return read_group_address_xml(path, name)
+    if extension == '.csv':
+        return read_group_address_csv(path, name)
+    raise ValueError(f'Unsupported ETS export [{path}], expected a .knxproj, .xml or .csv file')
+
+
+def import_ets_export(client, path: str, name: str = None, progress=None) -> BulkReport:
+    return client.bulk_create_project(read_ets_export(path, name), progress)
+
+
+def _get_default_name(path) -> str:
+    if isinstance(path, str):
+        return os.path.splitext(os.path.basename(path))[0]
+    return 'ETS project'
+
+
+def _get_local_name(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+def _read_project_name(xml_file) -> str:
+    for _, element in ElementTree.iterparse(xml_file, events=('start',)):
+        if _get_local_name(element.tag) == 'ProjectInformation':
+            return element.get('Name')
+    return None
+
+
+def _read_group_ranges(xml_file, builder: EtsProjectBuilder, packed_addresses: bool) -> None:
+    # only start events are needed, every element is dropped again once it ends so memory stays flat
+    ranges = []
+    parents = []
+    for event, element in ElementTree.iterparse(xml_file, events=('start', 'end')):
+        tag = _get_local_name(element.tag)
+        if event == 'end':
+            parents.pop()
+            if tag == 'GroupRange':
+                ranges.pop()
+            element.clear()
+            if parents:
+                parents[-1].remove(element)
+            continue
+        parents.append(element)
+        if tag == 'GroupRange':
+            ranges.append(element.get('Name'))
+            main_group, middle_group, _ = unpack_group_address(int(element.get('RangeStart', 0)))
+            if len(ranges) == 1:
+                builder.add_main_range(main_group, element.get('Name'))
+            elif len(ranges) == 2:
+                builder.add_middle_range(main_group, middle_group, element.get('Name'))
+        elif tag == 'GroupAddress':
+            address = element.get('Address')
+            if packed_addresses or address.isdigit():
+                main_group, middle_group, sub_group = unpack_group_address(int(address))
+            else:
+                main_group, middle_group, sub_group = (int(part) for part in address.split('/'))
+            builder.add_group_address(main_group, middle_group, sub_group, element.get('Name'),
+                                      get_data_type(element.get('DatapointType') or element.get('DPTs')))
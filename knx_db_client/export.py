@@ -0,0 +1,162 @@
+import csv
+import json
+import os
+from knx_db_client import knx_objects
+
+NDJSON = 'ndjson'
+CSV = 'csv'
+PARQUET = 'parquet'
+ARROW = 'arrow'
+EXPORT_FORMATS = (NDJSON, CSV, PARQUET, ARROW)
+EXTENSIONS = {'.ndjson': NDJSON, '.jsonl': NDJSON, '.csv': CSV, '.parquet': PARQUET, '.arrow': ARROW,
+              '.feather': ARROW}
+BATCH_SIZE = 10000
+CSV_COLUMNS = ('Group name', 'Address', 'Central', 'Unfiltered', 'Description', 'DatapointType', 'Security')
+COLUMNS = ('project_id', 'project_name', 'room_id', 'room_name', 'room_label', 'floor', 'device_id', 'device_label',
+           'device_type', 'name_affix', 'group_address_id', 'address', 'main_group', 'middle_group', 'sub_group',
+           'function', 'data_type')
+
+
+def get_export_format(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in EXTENSIONS:
+        raise ValueError(f'Unsupported export file [{path}], expected one of {", ".join(sorted(EXTENSIONS))}')
+    return EXTENSIONS[extension]
+
+
+def get_datapoint_type(data_type: str) -> str:
+    if not data_type:
+        return ''
+    main_number, _, sub_number = data_type.partition('.')
+    if not main_number.isdigit() or (sub_number and not sub_number.isdigit()):
+        return ''
+    if not sub_number:
+        return f'DPT-{int(main_number)}'
+    return f'DPST-{int(main_number)}-{int(sub_number)}'
+
+
+def export_project(client, project: knx_objects.Project, path: str, export_format: str = None) -> int:
+    if project is None:
+        raise ValueError('Project has no value!')
+    if export_format is None:
+        export_format = get_export_format(path)
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f'Unknown export format [{export_format}], expected one of {", ".join(EXPORT_FORMATS)}')
+    # trees already in memory are written as they are, server projects are streamed room by room
+    if project.is_loaded() and (project.get_rooms() or project.get_project_id() is None):
+        rooms = project.get_rooms()
+    else:
+        rooms = client.iter_rooms(project.get_project_id())
+    if export_format == NDJSON:
+        with open(path, 'w', encoding='utf-8') as output:
+            return write_ndjson(project, rooms, output)
+    if export_format == CSV:
+        with open(path, 'w', newline='', encoding='utf-8') as output:
+            return write_group_address_csv(rooms, output)
+    return write_columnar(project, rooms, path, export_format)
+
+
+def write_ndjson(project: knx_objects.Project, rooms, output) -> int:
+    project_id = project.get_project_id()
+    _write_record(output, 'project', project)
+    count = 0
+    for room in rooms:
+        room_id = room.get_room_id()
+        _write_record(output, 'room', room, projectid=project_id)
+        for device in room.get_devices():
+            device_id = device.get_device_id()
+            _write_record(output, 'device', device, projectid=project_id, roomid=room_id)
+            for address in device.get_group_addresses():
+                _write_record(output, 'group_address', address, projectid=project_id, roomid=room_id,
+                              deviceid=device_id)
+                count += 1
+    return count
+
+
+def write_group_address_csv(rooms, output) -> int:
+    writer = csv.writer(output, quoting=csv.QUOTE_ALL)
+    writer.writerow(CSV_COLUMNS)
+    # range rows are written on first use, rows follow the server order instead of being sorted by address
+    main_ranges = set()
+    middle_ranges = set()
+    count = 0
+    for room in rooms:
+        for device in room.get_devices():
+            for address in device.get_group_addresses():
+                main_group = address.get_main_group()
+                middle_group = address.get_middle_group()
+                if main_group not in main_ranges:
+                    main_ranges.add(main_group)
+                    writer.writerow(_get_csv_row(room.get_name(), f'{main_group}/-/-'))
+                if (main_group, middle_group) not in middle_ranges:
+                    middle_ranges.add((main_group, middle_group))
+                    writer.writerow(_get_csv_row(device.get_label(), f'{main_group}/{middle_group}/-'))
+                writer.writerow(_get_csv_row(address.get_function() or '', address.get_address(),
+                                             get_datapoint_type(address.get_data_type())))
+                count += 1
+    return count
+
+
+def write_columnar(project: knx_objects.Project, rooms, path: str, export_format: str = PARQUET) -> int:
+    # pyarrow is imported on first columnar export, loading it takes longer than the rest of the client
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise ValueError(f'Exporting {export_format} requires pyarrow, install knxdbclient[columnar]')
+    schema = _get_schema()
+    if export_format == PARQUET:
+        writer = pyarrow.parquet.ParquetWriter(path, schema)
+    else:
+        writer = pyarrow.ipc.new_file(path, schema)
+    count = 0
+    try:
+        batch = {column: [] for column in COLUMNS}
+        for room in rooms:
+            for device in room.get_devices():
+                for address in device.get_group_addresses():
+                    _append_row(batch, project, room, device, address)
+                    count += 1
+                    if count % BATCH_SIZE == 0:
+                        writer.write_batch(pyarrow.record_batch(batch, schema=schema))
+                        batch = {column: [] for column in COLUMNS}
+        if batch[COLUMNS[0]]:
+            writer.write_batch(pyarrow.record_batch(batch, schema=schema))
+    finally:
+        writer.close()
+    return count
+
+
+def _write_record(output, record_type: str, node, **parent_ids) -> None:
+    record = {'type': record_type}
+    record.update(parent_ids)
+    record.update(node.get_data())
+    output.write(json.dumps(record, separators=(',', ':')) + '\n')
+
+
+def _get_csv_row(name: str, address: str, datapoint_type: str = '') -> tuple:
+    return name, address, '', '', '', datapoint_type, 'Auto'
+
+
+def _get_schema():
+    import pyarrow
+    return pyarrow.schema([('project_id', pyarrow.int64()), ('project_name', pyarrow.string()),
+                           ('room_id', pyarrow.int64()), ('room_name', pyarrow.string()),
+                           ('room_label', pyarrow.string()), ('floor', pyarrow.string()),
+                           ('device_id', pyarrow.int64()), ('device_label', pyarrow.string()),
+                           ('device_type', pyarrow.string()), ('name_affix', pyarrow.string()),
+                           ('group_address_id', pyarrow.int64()), ('address', pyarrow.string()),
+                           ('main_group', pyarrow.uint8()), ('middle_group', pyarrow.uint8()),
+                           ('sub_group', pyarrow.uint8()), ('function', pyarrow.string()),
+                           ('data_type', pyarrow.string())])
+
+
+def _append_row(batch: dict, project: knx_objects.Project, room: knx_objects.Room, device: knx_objects.Device,
+                address: knx_objects.GroupAddress) -> None:
+    row = (project.get_project_id(), project.get_name(), room.get_room_id(), room.get_name(), room.get_label(),
+           room.get_floor(), device.get_device_id(), device.get_label(), device.get_device_type(),
+           device.get_name_affix(), address.get_group_address_id(), address.get_address(), address.get_main_group(),
+           address.get_middle_group(), address.get_sub_group(), address.get_function(), address.get_data_type())
+    for column, value in zip(COLUMNS, row):
+        batch[column].append(value)
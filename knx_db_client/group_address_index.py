@@ -0,0 +1,125 @@
+import threading
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from knx_db_client import knx_objects
+
+MAIN_GROUP_BITS = 5
+MIDDLE_GROUP_BITS = 3
+SUB_GROUP_BITS = 8
+MAX_MAIN_GROUP = (1 << MAIN_GROUP_BITS) - 1
+MAX_MIDDLE_GROUP = (1 << MIDDLE_GROUP_BITS) - 1
+MAX_SUB_GROUP = (1 << SUB_GROUP_BITS) - 1
+
+
+def pack_group_address(main_group: int, middle_group: int, sub_group: int) -> int:
+    if not 0 <= main_group <= MAX_MAIN_GROUP:
+        raise ValueError(f'Main group [{main_group}] out of range 0-{MAX_MAIN_GROUP}')
+    if not 0 <= middle_group <= MAX_MIDDLE_GROUP:
+        raise ValueError(f'Middle group [{middle_group}] out of range 0-{MAX_MIDDLE_GROUP}')
+    if not 0 <= sub_group <= MAX_SUB_GROUP:
+        raise ValueError(f'Sub group [{sub_group}] out of range 0-{MAX_SUB_GROUP}')
+    return (main_group << (MIDDLE_GROUP_BITS + SUB_GROUP_BITS)) | (middle_group << SUB_GROUP_BITS) | sub_group
+
+
+def unpack_group_address(packed_address: int) -> tuple:
+    return (packed_address >> (MIDDLE_GROUP_BITS + SUB_GROUP_BITS),
+            (packed_address >> SUB_GROUP_BITS) & MAX_MIDDLE_GROUP,
+            packed_address & MAX_SUB_GROUP)
+
+
+def pack(group_address: knx_objects.GroupAddress) -> int:
+    return pack_group_address(group_address.get_main_group(), group_address.get_middle_group(),
+                              group_address.get_sub_group())
+
+
+class GroupAddressIndex:
+    def __init__(self, project: knx_objects.Project = None):
+        self.by_address = {}
+        self.by_data_type = {}
+        self.by_function = {}
+        self.indexed_attributes = {}
+        self.sorted_addresses = array('H')
+        self.lock = threading.RLock()
+        self.project = None
+        if project is not None:
+            self.attach(project)
+
+    def attach(self, project: knx_objects.Project) -> None:
+        with self.lock:
+            for room in project.get_rooms():
+                for device in room.get_devices():
+                    for group_address in device.get_group_addresses():
+                        self.__store(group_address)
+            self.sorted_addresses = array('H', sorted(self.by_address))
+            project.add_group_address_listener(self.add)
+            self.project = project
+
+    def detach(self) -> None:
+        with self.lock:
+            if self.project is not None:
+                self.project.remove_group_address_listener(self.add)
+                self.project = None
+
+    def add(self, group_address: knx_objects.GroupAddress) -> None:
+        with self.lock:
+            packed_address = pack(group_address)
+            if packed_address not in self.by_address:
+                insort(self.sorted_addresses, packed_address)
+            self.__store(group_address)
+
+    def remove(self, group_address: knx_objects.GroupAddress) -> None:
+        with self.lock:
+            packed_address = pack(group_address)
+            if self.by_address.get(packed_address) is not group_address:
+                return
+            self.__unstore(packed_address)
+            del self.sorted_addresses[bisect_left(self.sorted_addresses, packed_address)]
+
+    def get(self, packed_address: int) -> knx_objects.GroupAddress:
+        return self.by_address.get(packed_address)
+
+    def get_by_address(self, main_group: int, middle_group: int, sub_group: int) -> knx_objects.GroupAddress:
+        return self.by_address.get(pack_group_address(main_group, middle_group, sub_group))
+
+    def find_by_data_type(self, data_type: str) -> list:
+        with self.lock:
+            return [self.by_address[packed_address]
+                    for packed_address in sorted(self.by_data_type.get(data_type, ()))]
+
+    def find_by_function(self, function: str) -> list:
+        with self.lock:
+            return [self.by_address[packed_address]
+                    for packed_address in sorted(self.by_function.get(function, ()))]
+
+    def find_range(self, main_group: int, middle_group: int = None) -> list:
+        if middle_group is None:
+            start = pack_group_address(main_group, 0, 0)
+            end = pack_group_address(main_group, MAX_MIDDLE_GROUP, MAX_SUB_GROUP)
+        else:
+            start = pack_group_address(main_group, middle_group, 0)
+            end = pack_group_address(main_group, middle_group, MAX_SUB_GROUP)
+        with self.lock:
+            low = bisect_left(self.sorted_addresses, start)
+            high = bisect_right(self.sorted_addresses, end)
+            return [self.by_address[packed_address] for packed_address in self.sorted_addresses[low:high]]
+
+    def __len__(self):
+        return len(self.by_address)
+
+    def __contains__(self, packed_address: int):
+        return packed_address in self.by_address
+
+    def __store(self, group_address: knx_objects.GroupAddress):
+        packed_address = pack(group_address)
+        if packed_address in self.by_address:
+            self.__unstore(packed_address)
+        self.by_address[packed_address] = group_address
+        self.indexed_attributes[packed_address] = (group_address.get_data_type(), group_address.get_function())
+        self.by_data_type.setdefault(group_address.get_data_type(), set()).add(packed_address)
+        self.by_function.setdefault(group_address.get_function(), set()).add(packed_address)
+
+    def __unstore(self, packed_address: int):
+        del self.by_address[packed_address]
+        data_type, function = self.indexed_attributes.pop(packed_address)
+        self.by_data_type[data_type].discard(packed_address)
+        self.by_function[function].discard(packed_address)
@@ -0,0 +1,139 @@
+import sys
+from array import array
+from knx_db_client import knx_objects
+from knx_db_client.group_address_index import pack_group_address, unpack_group_address
+
+NO_ID = -1
+NO_STRING = 0
+
+
+class GroupAddressView:
+    __slots__ = ('table', 'index')
+
+    def __init__(self, table, index: int):
+        self.table = table
+        self.index = index
+
+    def get_group_address_id(self):
+        return self.table.get_group_address_id(self.index)
+
+    def get_packed_address(self) -> int:
+        return self.table.packed_addresses[self.index]
+
+    def get_main_group(self) -> int:
+        return unpack_group_address(self.get_packed_address())[0]
+
+    def get_middle_group(self) -> int:
+        return unpack_group_address(self.get_packed_address())[1]
+
+    def get_sub_group(self) -> int:
+        return unpack_group_address(self.get_packed_address())[2]
+
+    def get_address(self) -> str:
+        return '/'.join(str(group) for group in unpack_group_address(self.get_packed_address()))
+
+    def get_data_type(self):
+        return self.table.strings[self.table.data_types[self.index]]
+
+    def get_function(self):
+        return self.table.strings[self.table.functions[self.index]]
+
+    def get_device_id(self):
+        return self.table.get_device_id(self.index)
+
+    def get_data(self) -> dict:
+        return self.to_group_address().get_data()
+
+    def to_group_address(self) -> knx_objects.GroupAddress:
+        main_group, middle_group, sub_group = unpack_group_address(self.get_packed_address())
+        result = knx_objects.GroupAddress(main_group, middle_group, sub_group, self.get_function(),
+                                          self.get_data_type())
+        result.set_group_address_id(self.get_group_address_id())
+        return result
+
+
+class GroupAddressTable:
+    def __init__(self):
+        self.group_address_ids = array('q')
+        self.packed_addresses = array('H')
+        self.data_types = array('I')
+        self.functions = array('I')
+        self.device_ids = array('q')
+        self.strings = [None]
+        self.string_codes = {None: NO_STRING}
+
+    def append(self, group_address_id: int, main_group: int, middle_group: int, sub_group: int,
+               function: str = None, data_type: str = None, device_id: int = None) -> int:
+        self.group_address_ids.append(NO_ID if group_address_id is None else group_address_id)
+        self.packed_addresses.append(pack_group_address(main_group, middle_group, sub_group))
+        self.data_types.append(self.__intern(data_type))
+        self.functions.append(self.__intern(function))
+        self.device_ids.append(NO_ID if device_id is None else device_id)
+        return len(self.packed_addresses) - 1
+
+    def add_group_address(self, group_address: knx_objects.GroupAddress) -> int:
+        device = group_address.get_device()
+        return self.append(group_address.get_group_address_id(), group_address.get_main_group(),
+                           group_address.get_middle_group(), group_address.get_sub_group(),
+                           group_address.get_function(), group_address.get_data_type(),
+                           device.get_device_id() if device is not None else None)
+
+    def add_group_address_json(self, group_address_json: dict, device_id: int = None) -> int:
+        return self.append(group_address_json[knx_objects.GroupAddress.GROUP_ADDRESS_ID],
+                           group_address_json[knx_objects.GroupAddress.MAIN_GROUP],
+                           group_address_json[knx_objects.GroupAddress.MIDDLE_GROUP],
+                           group_address_json[knx_objects.GroupAddress.SUB_GROUP],
+                           group_address_json.get(knx_objects.GroupAddress.FUNCTION),
+                           group_address_json.get(knx_objects.GroupAddress.DATA_TYPE), device_id)
+
+    def get_group_address_id(self, index: int):
+        group_address_id = self.group_address_ids[index]
+        return None if group_address_id == NO_ID else group_address_id
+
+    def get_device_id(self, index: int):
+        device_id = self.device_ids[index]
+        return None if device_id == NO_ID else device_id
+
+    def get_memory_size(self) -> int:
+        return sum(column.itemsize * len(column) for column in (self.group_address_ids, self.packed_addresses,
+                                                                 self.data_types, self.functions, self.device_ids))
+
+    def to_numpy(self) -> dict:
+        import numpy
+        return {'group_address_id': numpy.frombuffer(self.group_address_ids, dtype=numpy.int64),
+                'packed_address': numpy.frombuffer(self.packed_addresses, dtype=numpy.uint16),
+                'data_type': numpy.frombuffer(self.data_types, dtype=numpy.uint32),
+                'function': numpy.frombuffer(self.functions, dtype=numpy.uint32),
+                'device_id': numpy.frombuffer(self.device_ids, dtype=numpy.int64)}
+
+    def __len__(self):
+        return len(self.packed_addresses)
+
+    def __getitem__(self, index: int) -> GroupAddressView:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('Group address table index out of range')
+        return GroupAddressView(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield GroupAddressView(self, index)
+
+    def __intern(self, value: str) -> int:
+        code = self.string_codes.get(value)
+        if code is None:
+            code = len(self.strings)
+            value = sys.intern(value)
+            self.strings.append(value)
+            self.string_codes[value] = code
+        return code
+
+    @staticmethod
+    def from_project(project: knx_objects.Project):
+        result = GroupAddressTable()
+        for room in project.get_rooms():
+            for device in room.get_devices():
+                for group_address in device.get_group_addresses():
+                    result.add_group_address(group_address)
+        return result
@@ -0,0 +1,284 @@
+import contextvars
+import functools
+import inspect
+import logging
+import re
+import threading
+import time
+from bisect import bisect_left
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float('inf'))
+ID_SEGMENT = re.compile(r'/\d+(?=/|$)')
+
+logger = logging.getLogger(__name__)
+current_span = contextvars.ContextVar('knx_db_client_span', default=None)
+
+
+def get_endpoint(path: str) -> str:
+    return ID_SEGMENT.sub('/{id}', path.split('?', 1)[0])
+
+
+class RequestEvent:
+    def __init__(self, method: str, path: str, status_code: int = None, duration: float = 0.0,
+                 response_size: int = None, error: Exception = None):
+        self.method = method
+        self.path = path
+        self.endpoint = get_endpoint(path)
+        self.status_code = status_code
+        self.duration = duration
+        self.response_size = response_size
+        self.error = error
+
+    def get_method(self) -> str:
+        return self.method
+
+    def get_path(self) -> str:
+        return self.path
+
+    def get_endpoint(self) -> str:
+        return self.endpoint
+
+    def get_status_code(self) -> int:
+        return self.status_code
+
+    def get_duration(self) -> float:
+        return self.duration
+
+    def get_response_size(self) -> int:
+        return self.response_size
+
+    def get_error(self) -> Exception:
+        return self.error
+
+    def is_error(self) -> bool:
+        return self.error is not None or self.status_code is None or self.status_code >= 400
+
+
+class OperationSpan:
+    def __init__(self, name: str, parent=None):
+        self.name = name
+        self.parent = parent
+        self.started = time.perf_counter()
+        self.duration = None
+        self.request_count = 0
+        self.error_count = 0
+        self.response_bytes = 0
+        self.error = None
+        self.lock = threading.Lock()
+
+    def add_request(self, event: RequestEvent) -> None:
+        with self.lock:
+            self.request_count += 1
+            if event.is_error():
+                self.error_count += 1
+            if event.get_response_size():
+                self.response_bytes += event.get_response_size()
+        if self.parent is not None:
+            self.parent.add_request(event)
+
+    def finish(self, error: Exception = None) -> None:
+        self.duration = time.perf_counter() - self.started
+        self.error = error
+
+    def get_name(self) -> str:
+        return self.name
+
+    def get_parent(self):
+        return self.parent
+
+    def get_duration(self) -> float:
+        return self.duration
+
+    def get_request_count(self) -> int:
+        return self.request_count
+
+    def get_error_count(self) -> int:
+        return self.error_count
+
+    def get_response_bytes(self) -> int:
+        return self.response_bytes
+
+    def get_error(self) -> Exception:
+        return self.error
+
+
+class Instrumentation:
+    def on_request(self, event: RequestEvent) -> None:
+        pass
+
+    def on_operation(self, span: OperationSpan) -> None:
+        pass
+
+
+class CallbackHook(Instrumentation):
+    def __init__(self, on_request=None, on_operation=None):
+        self.request_callback = on_request
+        self.operation_callback = on_operation
+
+    def on_request(self, event: RequestEvent) -> None:
+        if self.request_callback is not None:
+            self.request_callback(event)
+
+    def on_operation(self, span: OperationSpan) -> None:
+        if self.operation_callback is not None:
+            self.operation_callback(span)
+
+
+class LoggingHook(Instrumentation):
+    def __init__(self, log: logging.Logger = None, request_level: int = logging.DEBUG,
+                 operation_level: int = logging.INFO):
+        if log:
+            self.log = log
+        else:
+            self.log = logger
+        self.request_level = request_level
+        self.operation_level = operation_level
+
+    def on_request(self, event: RequestEvent) -> None:
+        if event.get_error() is not None:
+            self.log.warning(f'{event.get_method()} {event.get_path()} failed after '
+                             f'{event.get_duration() * 1000:.1f} ms: {event.get_error()}')
+        else:
+            self.log.log(self.request_level, f'{event.get_method()} {event.get_path()} -> {event.get_status_code()} '
+                                             f'in {event.get_duration() * 1000:.1f} ms, '
+                                             f'{event.get_response_size()} bytes')
+
+    def on_operation(self, span: OperationSpan) -> None:
+        self.log.log(self.operation_level, f'{span.get_name()}: {span.get_request_count()} request(s), '
+                                           f'{span.get_error_count()} error(s) in '
+                                           f'{span.get_duration() * 1000:.1f} ms')
+
+
+class EndpointStats:
+    def __init__(self):
+        self.count = 0
+        self.error_count = 0
+        self.total_duration = 0.0
+        self.max_duration = 0.0
+        self.response_bytes = 0
+        self.histogram = [0] * len(LATENCY_BUCKETS)
+
+    def add(self, event: RequestEvent) -> None:
+        self.count += 1
+        if event.is_error():
+            self.error_count += 1
+        self.total_duration += event.get_duration()
+        self.max_duration = max(self.max_duration, event.get_duration())
+        if event.get_response_size():
+            self.response_bytes += event.get_response_size()
+        self.histogram[bisect_left(LATENCY_BUCKETS, event.get_duration())] += 1
+
+    def get_data(self) -> dict:
+        return {'count': self.count, 'errors': self.error_count, 'total_seconds': self.total_duration,
+                'max_seconds': self.max_duration, 'response_bytes': self.response_bytes,
+                'latency_histogram': dict(zip(LATENCY_BUCKETS, self.histogram))}
+
+
+class MetricsCollector(Instrumentation):
+    def __init__(self):
+        self.endpoints = {}
+        self.operations = {}
+        self.lock = threading.Lock()
+
+    def on_request(self, event: RequestEvent) -> None:
+        with self.lock:
+            key = f'{event.get_method()} {event.get_endpoint()}'
+            if key not in self.endpoints:
+                self.endpoints[key] = EndpointStats()
+            self.endpoints[key].add(event)
+
+    def on_operation(self, span: OperationSpan) -> None:
+        with self.lock:
+            stats = self.operations.setdefault(span.get_name(), {'count': 0, 'errors': 0, 'requests': 0,
+                                                                 'total_seconds': 0.0, 'max_seconds': 0.0})
+            stats['count'] += 1
+            if span.get_error() is not None:
+                stats['errors'] += 1
+            stats['requests'] += span.get_request_count()
+            stats['total_seconds'] += span.get_duration()
+            stats['max_seconds'] = max(stats['max_seconds'], span.get_duration())
+
+    def get_endpoint_stats(self) -> dict:
+        with self.lock:
+            return {key: stats.get_data() for key, stats in self.endpoints.items()}
+
+    def get_operation_stats(self) -> dict:
+        with self.lock:
+            return {name: dict(stats) for name, stats in self.operations.items()}
+
+    def get_request_count(self) -> int:
+        with self.lock:
+            return sum(stats.count for stats in self.endpoints.values())
+
+    def reset(self) -> None:
+        with self.lock:
+            self.endpoints.clear()
+            self.operations.clear()
+
+
+def record_request(hooks: list, event: RequestEvent) -> None:
+    span = current_span.get()
+    if span is not None:
+        span.add_request(event)
+    for hook in hooks:
+        hook.on_request(event)
+
+
+def iter_in_context(context: contextvars.Context, generator):
+    # every step of the generator runs in the given context, so context variables set for a generator
+    # operation apply while it works and never leak into the caller between items
+    try:
+        while True:
+            try:
+                item = context.run(next, generator)
+            except StopIteration:
+                return
+            yield item
+    finally:
+        context.run(generator.close)
+
+
+def operation(method):
+    if inspect.isgeneratorfunction(method):
+        return _generator_operation(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not self.hooks:
+            return method(self, *args, **kwargs)
+        span = OperationSpan(method.__name__, current_span.get())
+        token = current_span.set(span)
+        error = None
+        try:
+            return method(self, *args, **kwargs)
+        except Exception as err:
+            error = err
+            raise
+        finally:
+            current_span.reset(token)
+            span.finish(error)
+            for hook in self.hooks:
+                hook.on_operation(span)
+    return wrapper
+
+
+def _generator_operation(method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not self.hooks:
+            yield from method(self, *args, **kwargs)
+            return
+        span = OperationSpan(method.__name__, current_span.get())
+        context = contextvars.copy_context()
+        context.run(current_span.set, span)
+        error = None
+        try:
+            yield from iter_in_context(context, method(self, *args, **kwargs))
+        except Exception as err:
+            error = err
+            raise
+        finally:
+            span.finish(error)
+            for hook in self.hooks:
+                hook.on_operation(span)
+    return wrapper
@@ -1,7 +1,32 @@
 import requests
 import json
+import logging
+import contextvars
+import hashlib
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from functools import partial
+from urllib.parse import urlencode
+from requests.adapters import HTTPAdapter
 from http import HTTPStatus
 from knx_db_client import knx_objects
+from knx_db_client import json_decoding
+from knx_db_client import instrumentation
+from knx_db_client import resilience
+from knx_db_client.instrumentation import RequestEvent
+from knx_db_client.bulk_report import BulkReport, get_node_id
+from knx_db_client.response_cache import ResponseCache, HEADER_ETAG, HEADER_IF_NONE_MATCH
+from knx_db_client.resilience import RetryPolicy, CircuitBreaker, DeadlineExceeded
+from knx_db_client.single_flight import SingleFlight
+from knx_db_client.write_behind import WriteBehindQueue
+from knx_db_client.query import GroupAddressQuery, QueryResult
+from knx_db_client.validation import validate_project
+from knx_db_client.routing import EndpointRouter
+from knx_db_client.watch import ProjectWatcher
+from knx_db_client import sync_plan
+from knx_db_client.sync_plan import SyncPlan
 
 BASE_PATH = '/knx-db'
 HEADER_CONTENT_TYPE = 'Content-type'
@@ -9,10 +34,23 @@ HEADER_ACCEPT = 'Accept'
 APPLICATION_JSON = 'application/json'
 HOST = 'localhost'
 PORT = 8081
+POOL_SIZE = 10
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 30
+MAX_WORKERS = 8
+
+logger = logging.getLogger(__name__)
+# set inside fan-out workers, nested fan-outs run serially so concurrency stays within max_workers
+_fan_out_worker = contextvars.ContextVar('knx_db_client_fan_out_worker', default=False)
 
 
 class KnxDbClient:
-    def __init__(self, host: str = None, port: int = None, base_path: str = None):
+    def __init__(self, host: str = None, port: int = None, base_path: str = None, pool_size: int = None,
+                 connect_timeout: float = None, read_timeout: float = None, keep_alive: bool = True,
+                 max_workers: int = None, cache: ResponseCache = None, stream_lists: bool = False,
+                 hooks: list = None, retry_policy: RetryPolicy = None, circuit_breaker: CircuitBreaker = None,
+                 hedge_delay: float = None, operation_timeout: float = None, coalesce: bool = False,
+                 server_filters: list = None, router: EndpointRouter = None):
         if host:
             self.host = host
         else:
@@ -25,50 +63,176 @@ class KnxDbClient:
             self.base_path = base_path
         else:
             self.base_path = BASE_PATH
+        if pool_size:
+            self.pool_size = pool_size
+        else:
+            self.pool_size = POOL_SIZE
+        if connect_timeout:
+            self.connect_timeout = connect_timeout
+        else:
+            self.connect_timeout = CONNECT_TIMEOUT
+        if read_timeout:
+            self.read_timeout = read_timeout
+        else:
+            self.read_timeout = READ_TIMEOUT
+        if max_workers:
+            self.max_workers = max_workers
+        else:
+            self.max_workers = MAX_WORKERS
+        # shared by every fan-out of this client, chained stages together stay within max_workers
+        self.fan_out_slots = threading.BoundedSemaphore(self.max_workers)
+        self.cache = cache
+        self.stream_lists = stream_lists
+        if hooks:
+            self.hooks = list(hooks)
+        else:
+            self.hooks = []
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.hedge_delay = hedge_delay
+        self.operation_timeout = operation_timeout
+        if coalesce:
+            self.single_flight = SingleFlight()
+        else:
+            self.single_flight = None
+        if server_filters:
+            self.server_filters = frozenset(server_filters)
+        else:
+            self.server_filters = frozenset()
+        self.router = router
         self.url_start = f'http://{self.host}:{self.port}{self.base_path}'
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        if not keep_alive:
+            self.session.headers['Connection'] = 'close'
 
-    def get_project_list(self, filter_by_name: str = None) -> list:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        self.session.close()
+
+    @instrumentation.operation
+    @resilience.with_deadline
+    def get_project_list(self, filter_by_name: str = None, lazy: bool = False) -> list:
         try:
             project_list = self.__get_project_list_request(filter_by_name)
-            for project in project_list:
-                rooms_list = self.get_room_list(project.get_project_id())
-                for room in rooms_list:
-                    project.add_room(room)
+            if lazy:
+                for project in project_list:
+                    project.set_rooms_loader(partial(self.__get_lazy_room_list, project.get_project_id()))
+            else:
+                self.__load_rooms(project_list)
             return project_list
         except ValueError as err:
-            print(f'Get project list failed: {err}')
+            logger.error(f'Get project list failed: {err}')
 
-    def get_room_list(self, project_id: int) -> list:
+    @instrumentation.operation
+    @resilience.with_deadline
+    def get_room_list(self, project_id: int, lazy: bool = False) -> list:
         try:
+            if lazy:
+                return self.__get_lazy_room_list(project_id)
             room_list = self.__get_room_list_request(project_id)
-            for room in room_list:
-                device_list = self.get_device_list(room.get_room_id(), project_id)
-                for device in device_list:
-                    room.add_device(device)
+            self.__load_devices([(room, project_id) for room in room_list])
             return room_list
         except ValueError as err:
-            print(f'Get room list failed: {err}')
+            logger.error(f'Get room list failed: {err}')
 
-    def get_device_list(self, room_id: int, project_id) -> list:
+    @instrumentation.operation
+    @resilience.with_deadline
+    def get_device_list(self, room_id: int, project_id, lazy: bool = False) -> list:
         try:
+            if lazy:
+                return self.__get_lazy_device_list(room_id, project_id)
             device_list = self.__get_device_list_request(room_id, project_id)
-            for device in device_list:
-                group_address_list = self.get_group_address_list(device.get_device_id(), room_id, project_id)
-                for address in group_address_list:
-                    device.add_group_address(address)
+            self.__load_group_addresses([(device, room_id, project_id) for device in device_list])
             return device_list
         except ValueError as err:
-            print(f'Get device list failed: {err}')
+            logger.error(f'Get device list failed: {err}')
 
+    @instrumentation.operation
+    @resilience.with_deadline
     def get_group_address_list(self, device_id: int, room_id: int, project_id: int) -> list:
         try:
             return self.__get_group_address_list_request(device_id, room_id, project_id)
         except ValueError as err:
-            print(f'Get group address list failed: {err}')
+            logger.error(f'Get group address list failed: {err}')
+
+    @instrumentation.operation
+    @resilience.with_deadline
+    def iter_projects(self, filter_by_name: str = None):
+        projects = self.__get_project_list_request(filter_by_name)
+        for project, _ in self.__iter_fan_out(lambda item: self.__load_rooms([item]), projects):
+            yield project
+
+    @instrumentation.operation
+    @resilience.with_deadline
+    def iter_rooms(self, project_id: int):
+        rooms = self.__get_room_list_request(project_id)
+        for room, _ in self.__iter_fan_out(lambda item: self.__load_devices([(item, project_id)]), rooms):
+            yield room
 
+    @instrumentation.operation
+    @resilience.with_deadline
+    def iter_devices(self, room_id: int, project_id: int):
+        devices = self.__get_device_list_request(room_id, project_id)
+        for device, _ in self.__iter_fan_out(lambda item: self.__load_group_addresses([(item, room_id, project_id)]),
+                                             devices):
+            yield device
+
+    @instrumentation.operation
+    @resilience.with_deadline
+    def iter_group_addresses(self, project_id: int):
+        # parent links are weak, results hold their project, room and device so the caller can still reach them
+        project = self.__get_project_request(project_id)
+        rooms = self.__get_room_list_request(project_id)
+        for room in rooms:
+            room.set_project(project)
+        device_lists = self.__iter_fan_out(lambda room: self.__get_device_list_request(room.get_room_id(), project_id),
+                                           rooms)
+        devices = (self.__attach_room(device, room) for room, device_list in device_lists for device in device_list)
+        address_lists = self.__iter_fan_out(
+            lambda device: self.__get_group_address_list_request(device.get_device_id(),
+                                                                 device.get_room().get_room_id(), project_id),
+            devices)
+        for device, address_list in address_lists:
+            for address in address_list:
+                device.add_group_address(address)
+                yield QueryResult(project, device.get_room(), device, address)
+
+    @instrumentation.operation
+    @resilience.with_deadline
+    def get_project_fingerprint(self, project_id: int, watcher: ProjectWatcher = None) -> bytes:
+        # knx-db has no version for a project's subtree, the fingerprint combines the project record with the digest
+        # of every room, device and group address list; a watcher of the project revalidates those lists with
+        # If-None-Match, so repeated checks through it cost one bodiless response per unchanged list
+        project = self.__get_project_request(project_id)
+        if watcher is None:
+            watcher = ProjectWatcher(project, self.__get_list_version, max_workers=self.max_workers)
+        watcher.poll()
+        if watcher.is_removed():
+            raise ValueError(f'Unable to fingerprint project with ID [{project_id}]: project was removed')
+        project_record = json.dumps(project.get_data(), sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(f'{project_record}{watcher.get_digest()}'.encode('utf-8')).digest()
+
+    def watch_project(self, project_id: int, interval: float = None, listener=None) -> ProjectWatcher:
+        watcher = ProjectWatcher(self.__get_project_request(project_id), self.__get_list_version, interval,
+                                 self.max_workers)
+        if listener is not None:
+            watcher.add_listener(listener)
+        # the first poll records the baseline, changes are reported from the next poll on
+        watcher.poll()
+        return watcher
+
+    @instrumentation.operation
+    @resilience.with_deadline
     def create_project(self, project_to_save: knx_objects.Project) -> knx_objects.Project:
-        if project_to_save is None:
-            raise ValueError('Project has no value!')
+        validate_project(project_to_save).raise_for_issues()
         try:
             project = self.__create_project_request(project_to_save)
             project_to_save.set_project_id(project.get_project_id())
@@ -76,92 +240,663 @@ class KnxDbClient:
                 self.create_room(room_to_save)
             return project_to_save
         except ValueError as err:
-            print(f'Saving project failed: {err}')
+            logger.error(f'Saving project failed: {err}')
 
+    @instrumentation.operation
+    @resilience.with_deadline
     def create_room(self, room_to_save: knx_objects.Room) -> knx_objects.Room:
         if room_to_save is None:
             raise ValueError('Room has no value!')
-        if room_to_save.get_project() is None:
+        project = room_to_save.get_project()
+        if project is None:
             raise ValueError('Room has no parent project!')
-        if room_to_save.get_project().get_project_id() is None:
+        if project.get_project_id() is None:
             raise ValueError('Parent project has no ID!')
         try:
-            room = self.__create_room_request(room_to_save, room_to_save.get_project().get_project_id())
+            room = self.__create_room_request(room_to_save, project.get_project_id())
             room_to_save.set_room_id(room.get_room_id())
             for device_to_save in room_to_save.get_devices():
                 self.create_device(device_to_save)
             return room_to_save
         except ValueError as err:
-            print(f'Saving room failed: {err}')
+            logger.error(f'Saving room failed: {err}')
 
+    @instrumentation.operation
+    @resilience.with_deadline
     def create_device(self, device_to_save: knx_objects.Device) -> knx_objects.Device:
-        if device_to_save.get_room() is None:
+        room = device_to_save.get_room()
+        if room is None:
             raise ValueError('Device to save has no parent room')
-        if device_to_save.get_room().get_room_id() is None:
+        if room.get_room_id() is None:
             raise ValueError('Parent room has no room ID')
-        if device_to_save.get_room().get_project() is None:
+        project = room.get_project()
+        if project is None:
             raise ValueError('Room has no parent project!')
-        if device_to_save.get_room().get_project().get_project_id() is None:
+        if project.get_project_id() is None:
             raise ValueError('Parent project has no ID!')
         try:
-            device = self.__create_device_request(device_to_save, device_to_save.get_room().get_room_id(),
-                                                  device_to_save.get_room().get_project().get_project_id())
+            device = self.__create_device_request(device_to_save, room.get_room_id(), project.get_project_id())
             device_to_save.set_device_id(device.get_device_id())
             for address_to_save in device_to_save.get_group_addresses():
                 self.create_group_address(address_to_save)
             return device_to_save
         except ValueError as err:
-            print(f'Saving device failed: {err}')
+            logger.error(f'Saving device failed: {err}')
 
+    @instrumentation.operation
+    @resilience.with_deadline
     def create_group_address(self, address_to_save: knx_objects.GroupAddress) -> knx_objects.GroupAddress:
-        if address_to_save.get_device() is None:
+        device = address_to_save.get_device()
+        if device is None:
             raise ValueError('Group address has no parent device')
-        if address_to_save.get_device().get_device_id() is None:
+        if device.get_device_id() is None:
             raise ValueError('Parent device has no device ID')
-        if address_to_save.get_device().get_room() is None:
+        room = device.get_room()
+        if room is None:
             raise ValueError('Group Address has no parent room')
-        if address_to_save.get_device().get_room().get_room_id() is None:
+        if room.get_room_id() is None:
             raise ValueError('Parent room has no room ID')
-        if address_to_save.get_device().get_room().get_project() is None:
+        project = room.get_project()
+        if project is None:
             raise ValueError('Group Address has no parent project')
-        if address_to_save.get_device().get_room().get_project().get_project_id() is None:
+        if project.get_project_id() is None:
             raise ValueError('Parent project has no ID')
         try:
-            device = address_to_save.get_device()
-            address = self.__create_group_address_request(address_to_save,
-                                                          device.get_device_id(),
-                                                          device.get_room().get_room_id(),
-                                                          device.get_room().get_project().get_project_id())
+            address = self.__create_group_address_request(address_to_save, device.get_device_id(), room.get_room_id(),
+                                                          project.get_project_id())
             address_to_save.set_group_address_id(address.get_group_address_id())
+            project.notify_group_address(address_to_save)
             return address_to_save
         except ValueError as err:
-            print(f'Saving group address failed: {err}')
+            logger.error(f'Saving group address failed: {err}')
+
+    @instrumentation.operation
+    @resilience.with_deadline
+    def query_group_addresses(self, query: GroupAddressQuery, projects: list = None):
+        if projects is not None:
+            yield from query.scan(projects)
+            return
+        # parent links are weak, results hold their project, room and device so the caller can still reach them
+        projects = [project for project in self.__get_project_list_request(query.get_project_name())
+                    if query.matches_project(project)]
+        rooms = []
+        room_lists = self.__iter_fan_out(
+            lambda project: self.__get_room_list_request(project.get_project_id(), query.get_room_filters()),
+            projects)
+
+        def matching_rooms():
+            for project, room_list in room_lists:
+                for room in room_list:
+                    if query.matches_room(room):
+                        room.set_project(project)
+                        rooms.append(room)
+                        yield room
+
+        device_lists = self.__iter_fan_out(
+            lambda room: self.__get_device_list_request(room.get_room_id(), room.get_project().get_project_id(),
+                                                        query.get_device_filters()),
+            matching_rooms())
+        devices = (self.__attach_room(device, room) for room, device_list in device_lists for device in device_list
+                   if query.matches_device(device))
+        address_lists = self.__iter_fan_out(
+            lambda device: self.__get_group_address_list_request(device.get_device_id(),
+                                                                 device.get_room().get_room_id(),
+                                                                 device.get_room().get_project().get_project_id(),
+                                                                 query.get_group_address_filters()),
+            devices)
+        for device, address_list in address_lists:
+            for address in address_list:
+                if query.matches_group_address(address):
+                    device.add_group_address(address)
+                    yield QueryResult(device.get_room().get_project(), device.get_room(), device, address)
+
+    def write_behind(self, max_workers: int = None) -> WriteBehindQueue:
+        return WriteBehindQueue(self.__create_node, max_workers or self.max_workers)
 
-    def delete_project(self, project: knx_objects.Project):
-        for room in self.get_room_list(project.get_project_id()):
-            self.delete_room(room, project.get_project_id())
-        self.__delete_project_request(project)
+    @instrumentation.operation
+    @resilience.with_deadline
+    def prefetch(self, nodes: list, depth: int = 3):
+        for _ in range(depth):
+            child_lists = self.__fan_out(self.__get_children, [(node,) for node in nodes])
+            nodes = [child for child_list in child_lists for child in child_list]
 
-    def delete_room(self, room: knx_objects.Room, project_id: int):
-        for device in self.get_device_list(room.get_room_id(), project_id):
-            self.delete_device(device, room.get_room_id(), project_id)
-        self.__delete_room_request(room, project_id)
+    @instrumentation.operation
+    @resilience.with_deadline
+    def bulk_create_project(self, project_to_save: knx_objects.Project, progress=None) -> BulkReport:
+        validate_project(project_to_save).raise_for_issues()
+        rooms = project_to_save.get_rooms()
+        devices = [device for room in rooms for device in room.get_devices()]
+        total = 1 + len(rooms) + len(devices) + sum(len(device.get_group_addresses()) for device in devices)
+        report = BulkReport(total, progress)
+        projects = self.__bulk_create(report, self.__create_project_node, [project_to_save])
+        rooms = self.__bulk_create(report, self.__create_room_node, self.__children_of(projects))
+        devices = self.__bulk_create(report, self.__create_device_node, self.__children_of(rooms))
+        self.__bulk_create(report, self.__create_group_address_node, self.__children_of(devices))
+        return report
 
-    def delete_device(self, device: knx_objects.Device, room_id: int, project_id: int):
-        for address in self.get_group_address_list(device.get_device_id(), room_id, project_id):
-            self.delete_group_address(address, device.get_device_id(), room_id, project_id)
-        self.__delete_device_request(device, room_id, project_id)
+    @instrumentation.operation
+    @resilience.with_deadline
+    def plan_sync(self, local_project: knx_objects.Project) -> SyncPlan:
+        validate_project(local_project).raise_for_issues()
+        server_project = self.__find_project(local_project)
+        plan = SyncPlan(local_project, server_project)
+        if server_project is None:
+            plan.add_action(sync_plan.CREATE, local_project)
+            return plan
+        self.__load_rooms([server_project])
+        plan.add_match(local_project, server_project)
+        if sync_plan.get_content(local_project) != sync_plan.get_content(server_project):
+            plan.add_action(sync_plan.REPLACE, local_project, server_project)
+        self.__diff(plan, local_project.get_rooms(), server_project.get_rooms())
+        return plan
 
+    @instrumentation.operation
+    @resilience.with_deadline
+    def sync_project(self, local_project: knx_objects.Project, dry_run: bool = False) -> SyncPlan:
+        if local_project is None:
+            raise ValueError('Project has no value!')
+        plan = self.plan_sync(local_project)
+        if dry_run:
+            print(plan)
+            return plan
+        report = BulkReport()
+        for local_node, server_node in plan.get_matches():
+            sync_plan.set_node_id(local_node, get_node_id(server_node))
+        for local_node in plan.get_nodes(sync_plan.CREATE):
+            sync_plan.clear_node_ids(local_node)
+        self.__delete_subtree(
+            report,
+            rooms=[(room, room.get_project(), room.get_project().get_project_id())
+                   for room in plan.get_nodes(sync_plan.DELETE, knx_objects.Room)],
+            devices=[(device, device.get_room(), device.get_room().get_room_id(),
+                      device.get_room().get_project().get_project_id())
+                     for device in plan.get_nodes(sync_plan.DELETE, knx_objects.Device)],
+            addresses=[(address, address.get_device(), address.get_device().get_device_id(),
+                        address.get_device().get_room().get_room_id(),
+                        address.get_device().get_room().get_project().get_project_id())
+                       for address in plan.get_nodes(sync_plan.DELETE, knx_objects.GroupAddress)])
+        self.__bulk_apply(report, self.__replace_node, plan.get_nodes(sync_plan.REPLACE))
+        projects = self.__bulk_create(report, self.__create_project_node,
+                                      plan.get_nodes(sync_plan.CREATE, knx_objects.Project))
+        rooms = self.__bulk_create(report, self.__create_room_node,
+                                   plan.get_nodes(sync_plan.CREATE, knx_objects.Room) + self.__children_of(projects))
+        devices = self.__bulk_create(report, self.__create_device_node,
+                                     plan.get_nodes(sync_plan.CREATE, knx_objects.Device) + self.__children_of(rooms))
+        self.__bulk_create(report, self.__create_group_address_node,
+                           plan.get_nodes(sync_plan.CREATE, knx_objects.GroupAddress) + self.__children_of(devices))
+        plan.set_report(report)
+        return plan
+
+    @instrumentation.operation
+    @resilience.with_deadline
+    def delete_project(self, project: knx_objects.Project, use_loaded_tree: bool = False) -> BulkReport:
+        if project.get_project_id() is None:
+            raise ValueError('Unable to delete project: project has no ID')
+        report = BulkReport()
+        try:
+            if use_loaded_tree:
+                self.prefetch([project])
+                rooms = project.get_rooms()
+            else:
+                rooms = self.__get_room_list_request(project.get_project_id())
+                self.__load_devices([(room, project.get_project_id()) for room in rooms])
+        except (ValueError, requests.RequestException) as err:
+            report.add_failure(project, f'Loading project tree failed: {err}')
+            return report
+        blocked = self.__delete_subtree(report, rooms=[(room, project, project.get_project_id()) for room in rooms])
+        self.__bulk_delete(report, self.__delete_project_request, [(project, None)], blocked)
+        return report
+
+    @instrumentation.operation
+    @resilience.with_deadline
+    def delete_room(self, room: knx_objects.Room, project_id: int, use_loaded_tree: bool = False) -> BulkReport:
+        report = BulkReport()
+        try:
+            if use_loaded_tree:
+                self.prefetch([room], depth=2)
+                devices = room.get_devices()
+            else:
+                devices = self.__get_device_list_request(room.get_room_id(), project_id)
+                self.__load_group_addresses([(device, room.get_room_id(), project_id) for device in devices])
+        except (ValueError, requests.RequestException) as err:
+            report.add_failure(room, f'Loading room tree failed: {err}')
+            return report
+        blocked = self.__delete_subtree(report, devices=[(device, room, room.get_room_id(), project_id)
+                                                         for device in devices])
+        self.__bulk_delete(report, self.__delete_room_request, [(room, None, project_id)], blocked)
+        return report
+
+    @instrumentation.operation
+    @resilience.with_deadline
+    def delete_device(self, device: knx_objects.Device, room_id: int, project_id: int,
+                      use_loaded_tree: bool = False) -> BulkReport:
+        report = BulkReport()
+        try:
+            if use_loaded_tree:
+                self.prefetch([device], depth=1)
+                addresses = device.get_group_addresses()
+            else:
+                addresses = self.__get_group_address_list_request(device.get_device_id(), room_id, project_id)
+        except (ValueError, requests.RequestException) as err:
+            report.add_failure(device, f'Loading device tree failed: {err}')
+            return report
+        blocked = self.__delete_subtree(report, addresses=[(address, device, device.get_device_id(), room_id,
+                                                            project_id) for address in addresses])
+        self.__bulk_delete(report, self.__delete_device_request, [(device, None, room_id, project_id)], blocked)
+        return report
+
+    @instrumentation.operation
+    @resilience.with_deadline
     def delete_group_address(self, address: knx_objects.GroupAddress, device_id: int, room_id: int, project_id: int):
-        self.__delete_group_address_request(address, device_id, room_id, project_id)
+        try:
+            self.__delete_group_address_request(address, device_id, room_id, project_id)
+        except ValueError as err:
+            logger.error(f'Deleting group address failed: {err}')
+
+    def __bulk_create(self, report: BulkReport, create_node, nodes: list) -> list:
+        created = self.__bulk_apply(report, create_node, nodes)
+        created_ids = {id(node) for node in created}
+        for node in nodes:
+            if id(node) not in created_ids:
+                self.__skip_subtree(report, node)
+        return created
+
+    def __bulk_apply(self, report: BulkReport, apply_node, nodes: list) -> list:
+        def apply(node):
+            try:
+                apply_node(node)
+                report.add_success(node)
+                return True
+            except (ValueError, requests.RequestException) as err:
+                report.add_failure(node, str(err))
+                return False
+
+        applied = self.__fan_out(apply, [(node,) for node in nodes])
+        return [node for node, success in zip(nodes, applied) if success]
+
+    @staticmethod
+    def __children_of(parents: list) -> list:
+        return [child for parent in parents for child in KnxDbClient.__get_children(parent)]
+
+    @staticmethod
+    def __skip_subtree(report: BulkReport, parent):
+        for child in KnxDbClient.__get_children(parent):
+            report.add_failure(child, 'Parent was not created')
+            KnxDbClient.__skip_subtree(report, child)
+
+    @staticmethod
+    def __get_children(node) -> list:
+        if isinstance(node, knx_objects.Project):
+            return node.get_rooms()
+        if isinstance(node, knx_objects.Room):
+            return node.get_devices()
+        if isinstance(node, knx_objects.Device):
+            return node.get_group_addresses()
+        return []
+
+    def __create_node(self, node):
+        if isinstance(node, knx_objects.Project):
+            self.__create_project_node(node)
+        elif isinstance(node, knx_objects.Room):
+            self.__create_room_node(node)
+        elif isinstance(node, knx_objects.Device):
+            self.__create_device_node(node)
+        else:
+            self.__create_group_address_node(node)
+
+    def __create_project_node(self, project: knx_objects.Project):
+        saved_project = self.__create_project_request(project)
+        project.set_project_id(saved_project.get_project_id())
+
+    def __create_room_node(self, room: knx_objects.Room):
+        saved_room = self.__create_room_request(room, room.get_project().get_project_id())
+        room.set_room_id(saved_room.get_room_id())
+
+    def __create_device_node(self, device: knx_objects.Device):
+        room = device.get_room()
+        saved_device = self.__create_device_request(device, room.get_room_id(), room.get_project().get_project_id())
+        device.set_device_id(saved_device.get_device_id())
+
+    def __create_group_address_node(self, address: knx_objects.GroupAddress):
+        device = address.get_device()
+        saved_address = self.__create_group_address_request(address, device.get_device_id(),
+                                                            device.get_room().get_room_id(),
+                                                            device.get_room().get_project().get_project_id())
+        address.set_group_address_id(saved_address.get_group_address_id())
+        device.get_room().get_project().notify_group_address(address)
+
+    def __replace_node(self, node):
+        if isinstance(node, knx_objects.Project):
+            self.__replace_project_request(node)
+        elif isinstance(node, knx_objects.Room):
+            self.__replace_room_request(node, node.get_project().get_project_id())
+        elif isinstance(node, knx_objects.Device):
+            room = node.get_room()
+            self.__replace_device_request(node, room.get_room_id(), room.get_project().get_project_id())
+        else:
+            device = node.get_device()
+            self.__replace_group_address_request(node, device.get_device_id(), device.get_room().get_room_id(),
+                                                 device.get_room().get_project().get_project_id())
+
+    def __find_project(self, local_project: knx_objects.Project):
+        if local_project.get_project_id() is not None:
+            return self.__get_project_request(local_project.get_project_id())
+        for project in self.__get_project_list_request(local_project.get_name()):
+            if project.get_name() == local_project.get_name():
+                return project
+        return None
+
+    def __diff(self, plan: SyncPlan, local_nodes: list, server_nodes: list):
+        local_keys = set()
+        for local_node in local_nodes:
+            key = sync_plan.get_natural_key(local_node)
+            if key in local_keys:
+                raise ValueError(f'Unable to sync: duplicate {sync_plan.describe_node(local_node)}')
+            local_keys.add(key)
+        server_by_key = {}
+        leftovers = []
+        for server_node in server_nodes:
+            key = sync_plan.get_natural_key(server_node)
+            if key in server_by_key:
+                leftovers.append(server_node)
+            else:
+                server_by_key[key] = server_node
+        for local_node in local_nodes:
+            server_node = server_by_key.pop(sync_plan.get_natural_key(local_node), None)
+            if server_node is None:
+                plan.add_action(sync_plan.CREATE, local_node)
+                continue
+            plan.add_match(local_node, server_node)
+            if sync_plan.get_content(local_node) != sync_plan.get_content(server_node):
+                plan.add_action(sync_plan.REPLACE, local_node, server_node)
+            self.__diff(plan, self.__get_children(local_node), self.__get_children(server_node))
+        for server_node in leftovers + list(server_by_key.values()):
+            plan.add_action(sync_plan.DELETE, server_node)
+
+    def __delete_subtree(self, report: BulkReport, rooms: list = (), devices: list = (),
+                         addresses: list = ()) -> set:
+        devices = list(devices) + [(device, room, room.get_room_id(), project_id)
+                                   for room, _, project_id in rooms for device in room.get_devices()]
+        addresses = list(addresses) + [(address, device, device.get_device_id(), room_id, project_id)
+                                       for device, _, room_id, project_id in devices
+                                       for address in device.get_group_addresses()]
+        blocked = self.__bulk_delete(report, self.__delete_group_address_request, addresses, set())
+        blocked = self.__bulk_delete(report, self.__delete_device_request, devices, blocked)
+        return self.__bulk_delete(report, self.__delete_room_request, rooms, blocked)
+
+    def __bulk_delete(self, report: BulkReport, delete_request, entries: list, blocked: set) -> set:
+        def delete(node, parent, *parent_ids):
+            if id(node) in blocked:
+                report.add_failure(node, 'Children were not deleted')
+                return False
+            try:
+                delete_request(node, *parent_ids)
+                report.add_success(node)
+                return True
+            except (ValueError, requests.RequestException) as err:
+                report.add_failure(node, str(err))
+                return False
+
+        deleted = self.__fan_out(delete, entries)
+        return {id(entry[1]) for entry, success in zip(entries, deleted) if not success}
+
+    def __get_lazy_room_list(self, project_id: int) -> list:
+        room_list = self.__get_room_list_request(project_id)
+        for room in room_list:
+            room.set_devices_loader(partial(self.__get_lazy_device_list, room.get_room_id(), project_id))
+        return room_list
+
+    def __get_lazy_device_list(self, room_id: int, project_id: int) -> list:
+        device_list = self.__get_device_list_request(room_id, project_id)
+        for device in device_list:
+            device.set_group_addresses_loader(partial(self.__get_group_address_list_request,
+                                                      device.get_device_id(), room_id, project_id))
+        return device_list
+
+    def __load_rooms(self, projects: list):
+        room_lists = self.__fan_out(self.__get_room_list_request,
+                                    [(project.get_project_id(),) for project in projects])
+        rooms = []
+        for project, room_list in zip(projects, room_lists):
+            for room in room_list:
+                project.add_room(room)
+                rooms.append((room, project.get_project_id()))
+        self.__load_devices(rooms)
+
+    def __load_devices(self, rooms: list):
+        device_lists = self.__fan_out(self.__get_device_list_request,
+                                      [(room.get_room_id(), project_id) for room, project_id in rooms])
+        devices = []
+        for (room, project_id), device_list in zip(rooms, device_lists):
+            for device in device_list:
+                room.add_device(device)
+                devices.append((device, room.get_room_id(), project_id))
+        self.__load_group_addresses(devices)
+
+    def __load_group_addresses(self, devices: list):
+        address_lists = self.__fan_out(self.__get_group_address_list_request,
+                                       [(device.get_device_id(), room_id, project_id)
+                                        for device, room_id, project_id in devices])
+        for (device, room_id, project_id), address_list in zip(devices, address_lists):
+            for address in address_list:
+                device.add_group_address(address)
+
+    def __fan_out(self, request, args_list: list) -> list:
+        if self.max_workers <= 1 or len(args_list) <= 1 or _fan_out_worker.get():
+            return [request(*args) for args in args_list]
+        contexts = [self.__copy_worker_context() for _ in args_list]
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(args_list)))
+        try:
+            return list(executor.map(lambda context, args: context.run(self.__run_in_slot, request, *args),
+                                     contexts, args_list))
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    def __with_parameters(self, path: str, parameters: dict) -> str:
+        if not parameters:
+            return path
+        # only filters the server is known to support are pushed down, the rest is matched locally
+        supported = {key: value for key, value in parameters.items() if key in self.server_filters}
+        return f'{path}?{urlencode(supported)}' if supported else path
+
+    def __iter_fan_out(self, request, items):
+        if self.max_workers <= 1 or _fan_out_worker.get():
+            for item in items:
+                yield item, request(item)
+            return
+        # at most two requests per worker are in flight or buffered, results are yielded in input order
+        window = 2 * self.max_workers
+        pending = deque()
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            for item in items:
+                pending.append((item, executor.submit(self.__copy_worker_context().run, self.__run_in_slot, request,
+                                                      item)))
+                if len(pending) >= window:
+                    item, future = pending.popleft()
+                    yield item, future.result()
+            while pending:
+                item, future = pending.popleft()
+                yield item, future.result()
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    def __run_in_slot(self, request, *args):
+        with self.fan_out_slots:
+            return request(*args)
+
+    @staticmethod
+    def __copy_worker_context() -> contextvars.Context:
+        context = contextvars.copy_context()
+        context.run(_fan_out_worker.set, True)
+        return context
+
+    @staticmethod
+    def __attach_room(device: knx_objects.Device, room: knx_objects.Room) -> knx_objects.Device:
+        device.set_room(room)
+        return device
+
+    def __send(self, method: str, path: str, **kwargs) -> requests.Response:
+        if self.single_flight is None or method != 'GET':
+            return self.__send_uncoalesced(method, path, **kwargs)
+        # a coalesced response is handed to every waiting caller, so it is always read in full
+        kwargs.pop('stream', None)
+        active_deadline = resilience.current_deadline.get()
+        return self.single_flight.do(path, partial(self.__send_uncoalesced, method, path, **kwargs),
+                                     active_deadline.remaining() if active_deadline is not None else None)
+
+    def __send_uncoalesced(self, method: str, path: str, **kwargs) -> requests.Response:
+        if self.cache is None:
+            return self.__request(method, path, **kwargs)
+        if method == 'GET':
+            # cached responses are always read in full, streaming only applies without a cache
+            return self.__send_cached(path, kwargs.get('headers'))
+        response = self.__request(method, path, **kwargs)
+        if response.status_code < HTTPStatus.BAD_REQUEST:
+            self.cache.invalidate(method, path)
+        return response
+
+    def __decode_list(self, response: requests.Response, decoder, list_decoder) -> list:
+        if self.stream_lists:
+            return [decoder(item) for item in json_decoding.iter_array(
+                response.iter_content(json_decoding.CHUNK_SIZE))]
+        return list_decoder(json_decoding.loads(response.content))
+
+    def __send_cached(self, path: str, headers: dict = None) -> requests.Response:
+        entry = self.cache.get(path)
+        if entry is not None and self.cache.is_fresh(path, entry):
+            self.cache.record_hit()
+            return entry.get_response()
+        request_headers = dict(headers or {})
+        if entry is not None:
+            request_headers.update(entry.get_validators())
+        response = self.__request('GET', path, headers=request_headers)
+        if response.status_code == HTTPStatus.NOT_MODIFIED and entry is not None:
+            self.cache.refresh(path, entry)
+            return entry.get_response()
+        self.cache.record_miss()
+        if response.status_code == HTTPStatus.OK:
+            self.cache.put(path, response)
+        return response
+
+    def __request(self, method: str, path: str, **kwargs) -> requests.Response:
+        attempt = 0
+        while True:
+            connect_timeout = resilience.get_request_timeout(self.connect_timeout, f'{method} {path}')
+            read_timeout = resilience.get_request_timeout(self.read_timeout, f'{method} {path}')
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.before_request()
+            try:
+                if self.hedge_delay is not None and method == 'GET' and not kwargs.get('stream'):
+                    response = self.__hedged_attempt(path, (connect_timeout, read_timeout), **kwargs)
+                else:
+                    response = self.__attempt(method, path, (connect_timeout, read_timeout), **kwargs)
+            except requests.RequestException as err:
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.record_failure()
+                active_deadline = resilience.current_deadline.get()
+                if active_deadline is not None and active_deadline.is_expired():
+                    raise DeadlineExceeded(f'{method} {path} exceeded its deadline of '
+                                           f'{active_deadline.get_timeout()} s') from err
+                if self.retry_policy is None or not self.retry_policy.can_retry(method, attempt):
+                    raise
+                logger.debug(f'{method} {path} failed on attempt {attempt + 1}, retrying: {err}')
+            else:
+                if self.circuit_breaker is not None:
+                    if response.status_code >= HTTPStatus.INTERNAL_SERVER_ERROR:
+                        self.circuit_breaker.record_failure()
+                    else:
+                        self.circuit_breaker.record_success()
+                if self.retry_policy is None or not self.retry_policy.is_retryable_status(response.status_code) \
+                        or not self.retry_policy.can_retry(method, attempt):
+                    return response
+                logger.debug(f'{method} {path} returned HTTP status [{response.status_code}] on attempt '
+                             f'{attempt + 1}, retrying')
+                response.close()
+            delay = self.retry_policy.get_delay(attempt)
+            active_deadline = resilience.current_deadline.get()
+            if active_deadline is not None and delay >= active_deadline.remaining():
+                raise DeadlineExceeded(f'{method} {path} exceeded its deadline of {active_deadline.get_timeout()} s '
+                                       f'after {attempt + 1} attempt(s)')
+            time.sleep(delay)
+            attempt += 1
+
+    def __hedged_attempt(self, path: str, timeout: tuple, **kwargs) -> requests.Response:
+        attempts = [self.__start_attempt(path, timeout, **kwargs)]
+        done, pending = wait(attempts, timeout=self.hedge_delay)
+        if not done:
+            logger.debug(f'GET {path} slower than {self.hedge_delay} s, sending hedged request')
+            attempts.append(self.__start_attempt(path, timeout, **kwargs))
+            done, pending = wait(attempts, return_when=FIRST_COMPLETED)
+            winner = done.pop()
+            if winner.exception() is not None and pending:
+                done, pending = wait(pending)
+                winner = done.pop()
+            for attempt in attempts:
+                if attempt is not winner:
+                    attempt.add_done_callback(self.__discard_attempt)
+            return winner.result()
+        return done.pop().result()
+
+    def __start_attempt(self, path: str, timeout: tuple, **kwargs) -> Future:
+        # a discarded attempt keeps its thread until the slow response arrives, so attempts do not share a bounded
+        # pool where they would queue the next hedge behind them
+        future = Future()
+        context = contextvars.copy_context()
+
+        def run():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(context.run(self.__attempt, 'GET', path, timeout, **kwargs))
+            except BaseException as err:
+                future.set_exception(err)
+
+        threading.Thread(target=run, name='knx-db-hedge', daemon=True).start()
+        return future
+
+    @staticmethod
+    def __discard_attempt(attempt):
+        if attempt.exception() is None:
+            attempt.result().close()
+
+    def __attempt(self, method: str, path: str, timeout: tuple, **kwargs) -> requests.Response:
+        endpoint = self.router.select(method) if self.router is not None else None
+        url = f'{endpoint.get_url_start() if endpoint is not None else self.url_start}{path}'
+        if not self.hooks and endpoint is None:
+            return self.session.request(method, url, timeout=timeout, **kwargs)
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, url, timeout=timeout, **kwargs)
+        except requests.RequestException as err:
+            if endpoint is not None:
+                self.router.record(endpoint, time.perf_counter() - started, True)
+            if self.hooks:
+                instrumentation.record_request(self.hooks, RequestEvent(method, path,
+                                                                        duration=time.perf_counter() - started,
+                                                                        error=err))
+            raise
+        if endpoint is not None:
+            self.router.record(endpoint, time.perf_counter() - started,
+                               response.status_code >= HTTPStatus.INTERNAL_SERVER_ERROR)
+        if not self.hooks:
+            return response
+        if kwargs.get('stream'):
+            response_size = response.headers.get('Content-Length')
+            response_size = int(response_size) if response_size is not None else None
+        else:
+            response_size = len(response.content)
+        instrumentation.record_request(self.hooks, RequestEvent(method, path, response.status_code,
+                                                                time.perf_counter() - started, response_size))
+        return response
 
     def __create_project_request(self, project: knx_objects.Project) -> knx_objects.Project:
         request_headers = {HEADER_CONTENT_TYPE: APPLICATION_JSON, HEADER_ACCEPT: APPLICATION_JSON}
-        response = requests.post(f'{self.url_start}/projects', data=json.dumps(project.get_data()),
-                                 headers=request_headers)
+        response = self.__send('POST', '/projects', data=json.dumps(project.get_data()),
+                               headers=request_headers)
         if response.status_code == HTTPStatus.CREATED:
-            print(f'Project [{project.get_name()}] saved')
-            return knx_objects.Project.project_decoder(json.loads(response.text))
+            logger.debug(f'Project [{project.get_name()}] saved')
+            return knx_objects.Project.project_decoder(json_decoding.loads(response.content))
         else:
             raise ValueError(f'Create project returned HTTP status [{response.status_code}], error: {response.text}')
 
@@ -169,32 +904,32 @@ class KnxDbClient:
         if project.project_id is None:
             raise ValueError(f'Project ID cannot be empty')
         request_headers = {HEADER_CONTENT_TYPE: APPLICATION_JSON, HEADER_ACCEPT: APPLICATION_JSON}
-        response = requests.put(f'{self.url_start}/projects/{project.get_project_id()}',
-                                data=json.dumps(project.get_data()), headers=request_headers)
+        response = self.__send('PUT', f'/projects/{project.get_project_id()}',
+                               data=json.dumps(project.get_data()), headers=request_headers)
         if response.status_code == HTTPStatus.OK:
-            print(f'Project [{project.get_name()}] replaced')
-            return knx_objects.Project.project_decoder(json.loads(response.text))
+            logger.debug(f'Project [{project.get_name()}] replaced')
+            return knx_objects.Project.project_decoder(json_decoding.loads(response.content))
         else:
             raise ValueError(f'Replace project returned HTTP status [{response.status_code}], error: {response.text}')
 
     def __get_project_request(self, project_id: int) -> knx_objects.Project:
         request_headers = {HEADER_ACCEPT: APPLICATION_JSON}
-        response = requests.get(f'{self.url_start}/projects/{project_id}', headers=request_headers)
+        response = self.__send('GET', f'/projects/{project_id}', headers=request_headers)
         if response.status_code == HTTPStatus.OK:
-            print(f'Retrieved project with ID [{project_id}]')
-            return knx_objects.Project.project_decoder(json.loads(response.text))
+            logger.debug(f'Retrieved project with ID [{project_id}]')
+            return knx_objects.Project.project_decoder(json_decoding.loads(response.content))
         else:
             raise ValueError(f'Get project returned HTTP status [{response.status_code}] and error: {response.text}')
 
     def __get_project_list_request(self, filter_by_name: str = None) -> list:
         request_headers = {HEADER_ACCEPT: APPLICATION_JSON}
-        url = f'{self.url_start}/projects'
+        path = '/projects'
         if filter_by_name is not None:
-            url = url + f'?name={filter_by_name}'
-        response = requests.get(url, headers=request_headers)
+            path = path + f'?name={filter_by_name}'
+        response = self.__send('GET', path, headers=request_headers)
         if response.status_code == HTTPStatus.OK:
-            print('Project list retrieved')
-            return knx_objects.Project.project_list_decoder(json.loads(response.text))
+            logger.debug('Project list retrieved')
+            return knx_objects.Project.project_list_decoder(json_decoding.loads(response.content))
         else:
             raise ValueError(f'Get project list returned HTTP status [{response.status_code}], error: {response.text}')
 
@@ -202,14 +937,13 @@ class KnxDbClient:
         if project.get_project_id() is None:
             raise ValueError('Unable to delete project: project has no ID')
         request_headers = {HEADER_ACCEPT: APPLICATION_JSON}
-        response = requests.delete(f'{self.url_start}/projects/{project.get_project_id()}',
-                                   headers=request_headers)
+        response = self.__send('DELETE', f'/projects/{project.get_project_id()}',
+                               headers=request_headers)
         if response.status_code == HTTPStatus.OK:
-            print(f'Project [{project.get_name()}] deleted')
+            logger.debug(f'Project [{project.get_name()}] deleted')
             return True
         else:
-            print(f'Delete project returned HTTP status [{response.status_code}] and error: {response.text}')
-            return False
+            raise ValueError(f'Delete project returned HTTP status [{response.status_code}] and error: {response.text}')
 
     def __create_room_request(self, room: knx_objects.Room, project_id: int) -> knx_objects.Room:
         if project_id is None:
@@ -219,23 +953,37 @@ class KnxDbClient:
             raise ValueError('Unable to add room: invalid project ID')
 
         request_headers = {HEADER_CONTENT_TYPE: APPLICATION_JSON, HEADER_ACCEPT: APPLICATION_JSON}
-        response = requests.post(f'{self.url_start}/projects/{project_id}/rooms',
-                                 data=json.dumps(room.get_data()), headers=request_headers)
+        response = self.__send('POST', f'/projects/{project_id}/rooms',
+                               data=json.dumps(room.get_data()), headers=request_headers)
         if response.status_code == HTTPStatus.CREATED:
-            print(f'Room [{room.get_name()}] added to project with ID [{project_id}]')
-            saved_room = knx_objects.Room.room_decoder(json.loads(response.text))
+            logger.debug(f'Room [{room.get_name()}] added to project with ID [{project_id}]')
+            saved_room = knx_objects.Room.room_decoder(json_decoding.loads(response.content))
             room.set_room_id(saved_room.get_room_id())
             return room
         else:
             raise ValueError(f'Create room returned HTTP status [{response.status_code}] and error: {response.text}')
 
+    def __replace_room_request(self, room: knx_objects.Room, project_id: int) -> knx_objects.Room:
+        if room.get_room_id() is None:
+            raise ValueError('Room ID cannot be empty')
+        if project_id is None:
+            raise ValueError('Unable to replace room: invalid parent project ID')
+        request_headers = {HEADER_CONTENT_TYPE: APPLICATION_JSON, HEADER_ACCEPT: APPLICATION_JSON}
+        response = self.__send('PUT', f'/projects/{project_id}/rooms/{room.get_room_id()}',
+                               data=json.dumps(room.get_data()), headers=request_headers)
+        if response.status_code == HTTPStatus.OK:
+            logger.debug(f'Room [{room.get_name()}] replaced')
+            return knx_objects.Room.room_decoder(json_decoding.loads(response.content))
+        else:
+            raise ValueError(f'Replace room returned HTTP status [{response.status_code}], error: {response.text}')
+
     def __get_room_request(self, project_id: int, room_id: int):
         request_headers = {HEADER_ACCEPT: APPLICATION_JSON}
-        response = requests.get(f'{self.url_start}/projects/{project_id}/rooms/{room_id}',
-                                headers=request_headers)
+        response = self.__send('GET', f'/projects/{project_id}/rooms/{room_id}',
+                               headers=request_headers)
         if response.status_code == HTTPStatus.OK:
-            print(f'Retrieved room with ID [{room_id}]')
-            return knx_objects.Room.room_decoder(json.loads(response.text))
+            logger.debug(f'Retrieved room with ID [{room_id}]')
+            return knx_objects.Room.room_decoder(json_decoding.loads(response.content))
         else:
             raise ValueError(f'Get room returned HTTP status [{response.status_code}] and error: {response.text}')
 
@@ -245,15 +993,14 @@ class KnxDbClient:
         if project_id is None:
             raise ValueError('Unable to delete room: invalid parent project ID')
         request_headers = {HEADER_ACCEPT: APPLICATION_JSON}
-        response = requests.delete(
-            f'{self.url_start}/projects/{project_id}/rooms/{room.get_room_id()}',
+        response = self.__send(
+            'DELETE', f'/projects/{project_id}/rooms/{room.get_room_id()}',
             headers=request_headers)
         if response.status_code == HTTPStatus.OK:
-            print(f'Room [{room.get_name()}] deleted')
+            logger.debug(f'Room [{room.get_name()}] deleted')
             return True
         else:
-            print(f'Delete room returned HTTP status [{response.status_code}] and error: {response.text}')
-            return False
+            raise ValueError(f'Delete room returned HTTP status [{response.status_code}] and error: {response.text}')
 
     def __create_device_request(self, device: knx_objects.Device, room_id: int, project_id: int) -> knx_objects.Device:
         if room_id is None:
@@ -262,33 +1009,50 @@ class KnxDbClient:
             raise ValueError('Unable to save device: invalid parent project ID')
         device_json = device.get_data()
         request_headers = {HEADER_CONTENT_TYPE: APPLICATION_JSON, HEADER_ACCEPT: APPLICATION_JSON}
-        response = requests.post(
-            f'{self.url_start}/projects/{project_id}/rooms/{room_id}/devices',
+        response = self.__send(
+            'POST', f'/projects/{project_id}/rooms/{room_id}/devices',
             data=json.dumps(device_json), headers=request_headers)
         if response.status_code == HTTPStatus.CREATED:
-            print(f'Device [{device.get_label()}] added to room with ID [{room_id}]')
-            return knx_objects.Device.device_decoder(json.loads(response.text))
+            logger.debug(f'Device [{device.get_label()}] added to room with ID [{room_id}]')
+            return knx_objects.Device.device_decoder(json_decoding.loads(response.content))
         else:
             raise ValueError(f'Create device returned HTTP status [{response.status_code}], error: {response.text}')
 
+    def __replace_device_request(self, device: knx_objects.Device, room_id: int,
+                                 project_id: int) -> knx_objects.Device:
+        if device.get_device_id() is None:
+            raise ValueError('Device ID cannot be empty')
+        if room_id is None:
+            raise ValueError('Unable to replace device: invalid parent room ID')
+        if project_id is None:
+            raise ValueError('Unable to replace device: invalid parent project ID')
+        request_headers = {HEADER_CONTENT_TYPE: APPLICATION_JSON, HEADER_ACCEPT: APPLICATION_JSON}
+        response = self.__send(
+            'PUT', f'/projects/{project_id}/rooms/{room_id}/devices/{device.get_device_id()}',
+            data=json.dumps(device.get_data()), headers=request_headers)
+        if response.status_code == HTTPStatus.OK:
+            logger.debug(f'Device [{device.get_label()}] replaced')
+            return knx_objects.Device.device_decoder(json_decoding.loads(response.content))
+        else:
+            raise ValueError(f'Replace device returned HTTP status [{response.status_code}], error: {response.text}')
+
     def __delete_device_request(self, device: knx_objects.Device, room_id: int, project_id: int) -> bool:
         if room_id is None:
             raise ValueError('Unable to delete device: invalid parent room ID')
         if project_id is None:
             raise ValueError('Unable to delete device: invalid parent project ID')
         request_headers = {HEADER_ACCEPT: APPLICATION_JSON}
-        response = requests.delete(
-            f'{self.url_start}/projects/{project_id}/rooms/{room_id}/devices/{device.get_device_id()}',
+        response = self.__send(
+            'DELETE', f'/projects/{project_id}/rooms/{room_id}/devices/{device.get_device_id()}',
             headers=request_headers)
         if response.status_code == HTTPStatus.OK:
-            print(f'Device {device.get_label()} deleted')
+            logger.debug(f'Device {device.get_label()} deleted')
             return True
         else:
-            print(f'Delete device returned HTTP status [{response.status_code}] and error: {response.text}')
-            return False
+            raise ValueError(f'Delete device returned HTTP status [{response.status_code}] and error: {response.text}')
 
     def __delete_group_address_request(self, address: knx_objects.GroupAddress, device_id: int, room_id: int,
-                                       project_id: int):
+                                       project_id: int) -> bool:
         if device_id is None:
             raise ValueError('Unable to delete group address: invalid parent device ID')
         if room_id is None:
@@ -297,15 +1061,15 @@ class KnxDbClient:
             raise ValueError('Unable to delete group address: invalid parent project ID')
         request_headers = {HEADER_ACCEPT: APPLICATION_JSON}
         device_path = f'devices/{device_id}/group-addresses/{address.get_group_address_id()}'
-        response = requests.delete(
-            f'{self.url_start}/projects/{project_id}/rooms/{room_id}/{device_path}',
+        response = self.__send(
+            'DELETE', f'/projects/{project_id}/rooms/{room_id}/{device_path}',
             headers=request_headers)
         if response.status_code == HTTPStatus.OK:
-            print(f'Group address {address.get_address()} deleted')
+            logger.debug(f'Group address {address.get_address()} deleted')
             return True
         else:
-            print(f'Delete device returned HTTP status [{response.status_code}] and error: {response.text}')
-            return False
+            raise ValueError(
+                f'Delete group address returned HTTP status [{response.status_code}] and error: {response.text}')
 
     def __create_group_address_request(self, address: knx_objects.GroupAddress, device_id: int,
                                        room_id: int, project_id: int) -> knx_objects.GroupAddress:
@@ -317,43 +1081,87 @@ class KnxDbClient:
             raise ValueError('Unable to save group address: invalid parent project ID')
         address_json = address.get_data()
         request_headers = {HEADER_CONTENT_TYPE: APPLICATION_JSON, HEADER_ACCEPT: APPLICATION_JSON}
-        response = requests.post(
-            f'{self.url_start}/projects/{project_id}/rooms/{room_id}/devices/{device_id}/group-addresses',
+        response = self.__send(
+            'POST', f'/projects/{project_id}/rooms/{room_id}/devices/{device_id}/group-addresses',
             data=json.dumps(address_json), headers=request_headers)
         if response.status_code == HTTPStatus.CREATED:
             ga = address.get_address()
-            print(f'Group address [{ga}] added to device with ID [{device_id}]')
-            return knx_objects.GroupAddress.group_address_decoder(json.loads(response.text))
+            logger.debug(f'Group address [{ga}] added to device with ID [{device_id}]')
+            return knx_objects.GroupAddress.group_address_decoder(json_decoding.loads(response.content))
         else:
             raise ValueError(
                 f'Create group address returned HTTP status [{response.status_code}], error: {response.text}')
 
-    def __get_room_list_request(self, project_id: int) -> list:
+    def __replace_group_address_request(self, address: knx_objects.GroupAddress, device_id: int,
+                                        room_id: int, project_id: int) -> knx_objects.GroupAddress:
+        if address.get_group_address_id() is None:
+            raise ValueError('Group address ID cannot be empty')
+        if device_id is None:
+            raise ValueError('Unable to replace group address: invalid parent device ID')
+        if room_id is None:
+            raise ValueError('Unable to replace group address: invalid parent room ID')
+        if project_id is None:
+            raise ValueError('Unable to replace group address: invalid parent project ID')
+        request_headers = {HEADER_CONTENT_TYPE: APPLICATION_JSON, HEADER_ACCEPT: APPLICATION_JSON}
+        device_path = f'devices/{device_id}/group-addresses/{address.get_group_address_id()}'
+        response = self.__send(
+            'PUT', f'/projects/{project_id}/rooms/{room_id}/{device_path}',
+            data=json.dumps(address.get_data()), headers=request_headers)
+        if response.status_code == HTTPStatus.OK:
+            logger.debug(f'Group address [{address.get_address()}] replaced')
+            return knx_objects.GroupAddress.group_address_decoder(json_decoding.loads(response.content))
+        else:
+            raise ValueError(
+                f'Replace group address returned HTTP status [{response.status_code}], error: {response.text}')
+
+    def __get_list_version(self, ids: tuple, etag: str = None):
+        path = f'/projects/{ids[0]}/rooms'
+        if len(ids) > 1:
+            path += f'/{ids[1]}/devices'
+        if len(ids) > 2:
+            path += f'/{ids[2]}/group-addresses'
+        request_headers = {HEADER_ACCEPT: APPLICATION_JSON}
+        if etag is not None:
+            request_headers[HEADER_IF_NONE_MATCH] = etag
+        # the watcher compares versions itself, a cached copy would hide changes until it expires
+        response = self.__request('GET', path, headers=request_headers)
+        if response.status_code == HTTPStatus.NOT_MODIFIED:
+            return etag, None
+        if response.status_code == HTTPStatus.NOT_FOUND:
+            return None
+        if response.status_code == HTTPStatus.OK:
+            return response.headers.get(HEADER_ETAG), response.content
+        raise ValueError(f'Get list [{path}] returned HTTP status [{response.status_code}], error: {response.text}')
+
+    def __get_room_list_request(self, project_id: int, parameters: dict = None) -> list:
         if project_id is None:
             raise ValueError('Unable to retrieve room list: invalid project ID')
         request_headers = {HEADER_ACCEPT: APPLICATION_JSON}
-        response = requests.get(f'{self.url_start}/projects/{project_id}/rooms', headers=request_headers)
+        response = self.__send('GET', self.__with_parameters(f'/projects/{project_id}/rooms', parameters),
+                               headers=request_headers)
         if response.status_code == HTTPStatus.OK:
-            print('Rooms list retrieved')
-            return knx_objects.Room.room_list_decoder(json.loads(response.text))
+            logger.debug('Rooms list retrieved')
+            return knx_objects.Room.room_list_decoder(json_decoding.loads(response.content))
         else:
             raise ValueError(f'Get room list returned HTTP status [{response.status_code}], error: {response.text}')
 
-    def __get_device_list_request(self, room_id: int, project_id: int):
+    def __get_device_list_request(self, room_id: int, project_id: int, parameters: dict = None):
         if room_id is None:
             raise ValueError('Unable to retrieve device list: invalid room ID')
         if project_id is None:
             raise ValueError('Unable to retrieve device list: invalid project ID')
         request_headers = {HEADER_ACCEPT: APPLICATION_JSON}
-        response = requests.get(f'{self.url_start}/projects/{project_id}/rooms/{room_id}/devices',
-                                headers=request_headers)
-        if response.status_code == HTTPStatus.OK:
-            print('Device list retrieved')
-            return knx_objects.Device.device_list_decoder(json.loads(response.text))
-        else:
-            raise ValueError(f'Get device list returned HTTP status [{response.status_code}], error: {response.text}')
+        with self.__send('GET', self.__with_parameters(f'/projects/{project_id}/rooms/{room_id}/devices', parameters),
+                         headers=request_headers, stream=self.stream_lists) as response:
+            if response.status_code == HTTPStatus.OK:
+                logger.debug('Device list retrieved')
+                return self.__decode_list(response, knx_objects.Device.device_decoder,
+                                          knx_objects.Device.device_list_decoder)
+            else:
+                raise ValueError(
+                    f'Get device list returned HTTP status [{response.status_code}], error: {response.text}')
 
-    def __get_group_address_list_request(self, device_id, room_id, project_id):
+    def __get_group_address_list_request(self, device_id, room_id, project_id, parameters: dict = None):
         if device_id is None:
             raise ValueError('Unable to retrieve group address list: invalid device ID')
         if room_id is None:
@@ -361,12 +1169,13 @@ class KnxDbClient:
         if project_id is None:
             raise ValueError('Unable to retrieve group address list: invalid project ID')
         request_headers = {HEADER_ACCEPT: APPLICATION_JSON}
-        response = requests.get(
-            f'{self.url_start}/projects/{project_id}/rooms/{room_id}/devices/{device_id}/group-addresses',
-            headers=request_headers)
-        if response.status_code == HTTPStatus.OK:
-            print('Group address list retrieved')
-            return knx_objects.GroupAddress.group_address_list_decoder(json.loads(response.text))
-        else:
-            raise ValueError(
-                f'Get group address list returned HTTP status [{response.status_code}], error: {response.text}')
+        path = f'/projects/{project_id}/rooms/{room_id}/devices/{device_id}/group-addresses'
+        with self.__send('GET', self.__with_parameters(path, parameters), headers=request_headers,
+                         stream=self.stream_lists) as response:
+            if response.status_code == HTTPStatus.OK:
+                logger.debug('Group address list retrieved')
+                return self.__decode_list(response, knx_objects.GroupAddress.group_address_decoder,
+                                          knx_objects.GroupAddress.group_address_list_decoder)
+            else:
+                raise ValueError(
+                    f'Get group address list returned HTTP status [{response.status_code}], error: {response.text}')
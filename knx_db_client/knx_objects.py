@@ -1,4 +1,8 @@
+import weakref
+
+
 class GroupAddress:
+    __slots__ = ('group_address_id', 'main_group', 'middle_group', 'sub_group', 'function', 'data_type', 'device')
     GROUP_ADDRESS_ID = 'groupAddressId'
     MAIN_GROUP = 'mainGroup'
     MIDDLE_GROUP = 'middleGroup'
@@ -43,10 +47,10 @@ class GroupAddress:
         return self.function
 
     def set_device(self, device):
-        self.device = device
+        self.device = weakref.ref(device) if device is not None else None
 
     def get_device(self):
-        return self.device
+        return self.device() if self.device is not None else None
 
     def get_address(self) -> str:
         return f'{self.main_group}/{self.middle_group}/{self.sub_group}'
@@ -92,6 +96,8 @@ class GroupAddress:
 
 
 class Device:
+    __slots__ = ('device_id', 'label', 'name_affix', 'device_type', 'group_addresses', 'group_addresses_loader',
+                 'room', '__weakref__')
     DEVICE_ID = 'deviceid'
     LABEL = 'label'
     NAME_AFFIX = 'nameAffix'
@@ -104,6 +110,7 @@ class Device:
         self.name_affix = None
         self.device_type = device_type
         self.group_addresses = []
+        self.group_addresses_loader = None
         self.room = None
 
     def set_name_affix(self, name_affix: str):
@@ -121,17 +128,34 @@ class Device:
     def add_group_address(self, group_address: GroupAddress):
         group_address.set_device(self)
         self.group_addresses.append(group_address)
+        room = self.get_room()
+        if room is not None and room.get_project() is not None:
+            room.get_project().notify_group_address(group_address)
 
     def get_label(self) -> str:
         return self.label
 
+    def get_device_type(self) -> str:
+        return self.device_type
+
     def get_room(self):
-        return self.room
+        return self.room() if self.room is not None else None
 
     def set_room(self, room):
-        self.room = room
+        self.room = weakref.ref(room) if room is not None else None
+
+    def set_group_addresses_loader(self, loader) -> None:
+        self.group_addresses_loader = loader
+
+    def is_loaded(self) -> bool:
+        return self.group_addresses_loader is None
 
     def get_group_addresses(self) -> list:
+        if self.group_addresses_loader is not None:
+            group_addresses = self.group_addresses_loader()
+            self.group_addresses_loader = None
+            for group_address in group_addresses:
+                self.add_group_address(group_address)
         return self.group_addresses
 
     def get_data(self) -> dict:
@@ -165,6 +189,7 @@ class Device:
 
 
 class Room:
+    __slots__ = ('room_id', 'name', 'label', 'floor', 'devices', 'devices_loader', 'project', '__weakref__')
     ROOM_ID = 'roomid'
     NAME = 'name'
     LABEL = 'label'
@@ -177,6 +202,7 @@ class Room:
         self.label = label
         self.floor = floor
         self.devices = []
+        self.devices_loader = None
         self.project = None
 
     def set_room_id(self, room_id: int):
@@ -188,20 +214,41 @@ class Room:
     def set_floor(self, floor: str):
         self.floor = floor
 
+    def get_floor(self) -> str:
+        return self.floor
+
     def add_device(self, device: Device):
         device.set_room(self)
         self.devices.append(device)
+        project = self.get_project()
+        if project is not None and project.group_address_listeners:
+            for group_address in device.group_addresses:
+                project.notify_group_address(group_address)
 
     def get_name(self) -> str:
         return self.name
 
+    def get_label(self) -> str:
+        return self.label
+
     def get_project(self):
-        return self.project
+        return self.project() if self.project is not None else None
 
     def set_project(self, project):
-        self.project = project
+        self.project = weakref.ref(project) if project is not None else None
+
+    def set_devices_loader(self, loader) -> None:
+        self.devices_loader = loader
+
+    def is_loaded(self) -> bool:
+        return self.devices_loader is None
 
     def get_devices(self) -> list:
+        if self.devices_loader is not None:
+            devices = self.devices_loader()
+            self.devices_loader = None
+            for device in devices:
+                self.add_device(device)
         return self.devices
 
     def get_data(self) -> dict:
@@ -236,6 +283,7 @@ class Room:
 
 
 class Project:
+    __slots__ = ('project_id', 'name', 'rooms', 'rooms_loader', 'group_address_listeners', '__weakref__')
     PROJECT_ID = 'projectid'
     NAME = 'name'
     ROOMS = 'rooms'
@@ -244,10 +292,26 @@ class Project:
         self.project_id = None
         self.name = name
         self.rooms = []
+        self.rooms_loader = None
+        self.group_address_listeners = []
 
     def add_room(self, room: Room) -> None:
         room.set_project(self)
         self.rooms.append(room)
+        if self.group_address_listeners:
+            for device in room.devices:
+                for group_address in device.group_addresses:
+                    self.notify_group_address(group_address)
+
+    def add_group_address_listener(self, listener) -> None:
+        self.group_address_listeners.append(listener)
+
+    def remove_group_address_listener(self, listener) -> None:
+        self.group_address_listeners.remove(listener)
+
+    def notify_group_address(self, group_address: GroupAddress) -> None:
+        for listener in self.group_address_listeners:
+            listener(group_address)
 
     def set_project_id(self, project_id: int) -> None:
         self.project_id = project_id
@@ -267,7 +331,18 @@ class Project:
 
         return result
 
+    def set_rooms_loader(self, loader) -> None:
+        self.rooms_loader = loader
+
+    def is_loaded(self) -> bool:
+        return self.rooms_loader is None
+
     def get_rooms(self) -> list:
+        if self.rooms_loader is not None:
+            rooms = self.rooms_loader()
+            self.rooms_loader = None
+            for room in rooms:
+                self.add_room(room)
         return self.rooms
 
     @staticmethod
@@ -0,0 +1,280 @@
+import hashlib
+import json
+import random
+import sys
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qsl
+from knx_db_client import knx_objects
+
+BASE_PATH = '/knx-db'
+HOST = '127.0.0.1'
+ID_KEYS = {'projects': knx_objects.Project.PROJECT_ID, 'rooms': knx_objects.Room.ROOM_ID,
+           'devices': knx_objects.Device.DEVICE_ID, 'group-addresses': knx_objects.GroupAddress.GROUP_ADDRESS_ID}
+DEFAULTS = {'projects': {}, 'rooms': {knx_objects.Room.FLOOR: None},
+            'devices': {knx_objects.Device.NAME_AFFIX: None},
+            'group-addresses': {knx_objects.GroupAddress.DATA_TYPE: None, knx_objects.GroupAddress.FUNCTION: None}}
+CHILD_COLLECTIONS = {None: 'projects', 'projects': 'rooms', 'rooms': 'devices', 'devices': 'group-addresses'}
+
+
+class MockKnxDbStore:
+    def __init__(self):
+        self.nodes = {}
+        self.collections = {}
+        self.next_id = 1
+        self.request_count = 0
+        self.lock = threading.RLock()
+
+    def list(self, parent: tuple, collection: str) -> list:
+        with self.lock:
+            if parent and parent not in self.nodes:
+                return None
+            return list(self.collections.get((parent, collection), {}).values())
+
+    def get(self, path: tuple) -> dict:
+        with self.lock:
+            return self.nodes.get(path)
+
+    def create(self, parent: tuple, collection: str, data: dict) -> dict:
+        with self.lock:
+            if parent and parent not in self.nodes:
+                return None
+            node_id = self.next_id
+            self.next_id += 1
+            node = dict(DEFAULTS[collection])
+            node.update(data)
+            node[ID_KEYS[collection]] = node_id
+            self.nodes[parent + (collection, node_id)] = node
+            self.collections.setdefault((parent, collection), {})[node_id] = node
+            return node
+
+    def replace(self, path: tuple, data: dict) -> dict:
+        with self.lock:
+            if path not in self.nodes:
+                return None
+            collection = path[-2]
+            node = dict(DEFAULTS[collection])
+            node.update(data)
+            node[ID_KEYS[collection]] = path[-1]
+            self.nodes[path] = node
+            self.collections[(path[:-2], collection)][path[-1]] = node
+            return node
+
+    def delete(self, path: tuple) -> bool:
+        with self.lock:
+            if path not in self.nodes:
+                return False
+            self.__delete_subtree(path)
+            del self.collections[(path[:-2], path[-2])][path[-1]]
+            return True
+
+    def add_project(self, project: knx_objects.Project) -> dict:
+        with self.lock:
+            project_json = self.create((), 'projects', project.get_data())
+            project.set_project_id(project_json[ID_KEYS['projects']])
+            project_path = ('projects', project.get_project_id())
+            for room in project.get_rooms():
+                room.set_room_id(self.create(project_path, 'rooms', room.get_data())[ID_KEYS['rooms']])
+                room_path = project_path + ('rooms', room.get_room_id())
+                for device in room.get_devices():
+                    device.set_device_id(self.create(room_path, 'devices', device.get_data())[ID_KEYS['devices']])
+                    device_path = room_path + ('devices', device.get_device_id())
+                    for address in device.get_group_addresses():
+                        address_json = self.create(device_path, 'group-addresses', address.get_data())
+                        address.set_group_address_id(address_json[ID_KEYS['group-addresses']])
+            return project_json
+
+    def count_request(self) -> None:
+        with self.lock:
+            self.request_count += 1
+
+    def get_request_count(self) -> int:
+        return self.request_count
+
+    def get_node_count(self) -> int:
+        return len(self.nodes)
+
+    def __delete_subtree(self, path: tuple):
+        child_collection = CHILD_COLLECTIONS.get(path[-2])
+        children = self.collections.pop((path, child_collection), {}) if child_collection else {}
+        for child_id in children:
+            self.__delete_subtree(path + (child_collection, child_id))
+        del self.nodes[path]
+
+
+class MockKnxDbRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.__handle('GET')
+
+    def do_POST(self):
+        self.__handle('POST')
+
+    def do_PUT(self):
+        self.__handle('PUT')
+
+    def do_DELETE(self):
+        self.__handle('DELETE')
+
+    def __handle(self, method: str):
+        server = self.server
+        store = server.store
+        store.count_request()
+        latency = server.latency
+        if server.slow_rate and random.random() < server.slow_rate:
+            latency += server.slow_latency
+        if latency:
+            time.sleep(latency)
+        url = urlsplit(self.path)
+        body = self.__read_body()
+        if server.error_rate and random.random() < server.error_rate:
+            return self.__respond(HTTPStatus.SERVICE_UNAVAILABLE, {'error': 'Injected failure'})
+        if not url.path.startswith(server.base_path):
+            return self.__respond(HTTPStatus.NOT_FOUND, {'error': 'Unknown path'})
+        try:
+            path, collection = self.__parse_path(url.path[len(server.base_path):])
+        except ValueError:
+            return self.__respond(HTTPStatus.BAD_REQUEST, {'error': 'Invalid ID'})
+        if collection is not None and collection not in ID_KEYS:
+            return self.__respond(HTTPStatus.NOT_FOUND, {'error': 'Unknown collection'})
+        if method == 'GET' and collection is not None:
+            nodes = store.list(path, collection)
+            if nodes is None:
+                return self.__respond(HTTPStatus.NOT_FOUND, {'error': 'Parent not found'})
+            for key, value in parse_qsl(url.query):
+                nodes = [node for node in nodes if str(node.get(key)) == value]
+            return self.__respond(HTTPStatus.OK, nodes)
+        if method == 'GET':
+            return self.__respond_node(HTTPStatus.OK, store.get(path))
+        if method == 'POST' and collection is not None:
+            return self.__respond_node(HTTPStatus.CREATED, store.create(path, collection, json.loads(body)))
+        if method == 'PUT' and collection is None:
+            return self.__respond_node(HTTPStatus.OK, store.replace(path, json.loads(body)))
+        if method == 'DELETE' and collection is None:
+            if store.delete(path):
+                return self.__respond(HTTPStatus.OK)
+            return self.__respond(HTTPStatus.NOT_FOUND, {'error': 'Not found'})
+        return self.__respond(HTTPStatus.METHOD_NOT_ALLOWED, {'error': 'Method not allowed'})
+
+    def __read_body(self) -> bytes:
+        length = int(self.headers.get('Content-Length', 0))
+        return self.rfile.read(length) if length else b''
+
+    @staticmethod
+    def __parse_path(path: str) -> tuple:
+        segments = [segment for segment in path.split('/') if segment]
+        result = ()
+        for index in range(0, len(segments) - 1, 2):
+            result += (segments[index], int(segments[index + 1]))
+        if len(segments) % 2 == 1:
+            return result, segments[-1]
+        return result, None
+
+    def __respond_node(self, status: HTTPStatus, node: dict):
+        if node is None:
+            return self.__respond(HTTPStatus.NOT_FOUND, {'error': 'Not found'})
+        return self.__respond(status, node)
+
+    def __respond(self, status: HTTPStatus, payload=None):
+        body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+        etag = None
+        if self.server.etags and self.command == 'GET' and status == HTTPStatus.OK:
+            etag = f'"{hashlib.sha1(body).hexdigest()}"'
+            if self.headers.get('If-None-Match') == etag:
+                status = HTTPStatus.NOT_MODIFIED
+                body = b''
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if etag is not None:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class MockKnxDbHttpServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # clients that give up on a slow response (deadlines, hedging) close their connection mid-write
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class MockKnxDbServer:
+    def __init__(self, host: str = None, port: int = 0, base_path: str = None, latency: float = 0.0,
+                 store: MockKnxDbStore = None, etags: bool = False, error_rate: float = 0.0, slow_rate: float = 0.0,
+                 slow_latency: float = 0.0):
+        if host:
+            self.host = host
+        else:
+            self.host = HOST
+        if base_path:
+            self.base_path = base_path
+        else:
+            self.base_path = BASE_PATH
+        if store:
+            self.store = store
+        else:
+            self.store = MockKnxDbStore()
+        self.port = port
+        self.latency = latency
+        self.etags = etags
+        self.error_rate = error_rate
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.http_server = None
+        self.thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def start(self):
+        self.http_server = MockKnxDbHttpServer((self.host, self.port), MockKnxDbRequestHandler)
+        self.http_server.store = self.store
+        self.http_server.base_path = self.base_path
+        self.http_server.latency = self.latency
+        self.http_server.etags = self.etags
+        self.http_server.error_rate = self.error_rate
+        self.http_server.slow_rate = self.slow_rate
+        self.http_server.slow_latency = self.slow_latency
+        self.port = self.http_server.server_address[1]
+        self.thread = threading.Thread(target=self.http_server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        if self.http_server is not None:
+            self.http_server.shutdown()
+            self.http_server.server_close()
+            self.http_server = None
+
+    def set_latency(self, latency: float):
+        self.latency = latency
+        if self.http_server is not None:
+            self.http_server.latency = latency
+
+    def get_host(self) -> str:
+        return self.host
+
+    def get_port(self) -> int:
+        return self.port
+
+    def get_base_path(self) -> str:
+        return self.base_path
+
+    def get_store(self) -> MockKnxDbStore:
+        return self.store
+
+    def get_request_count(self) -> int:
+        return self.store.get_request_count()
@@ -0,0 +1,128 @@
+from knx_db_client import knx_objects
+from knx_db_client.group_address_index import MAX_MAIN_GROUP, MAX_MIDDLE_GROUP, MAX_SUB_GROUP
+
+WILDCARD = '*'
+
+
+def parse_address_pattern(pattern: str) -> tuple:
+    parts = pattern.strip().split('/')
+    if len(parts) != 3:
+        raise ValueError(f'Invalid group address pattern [{pattern}], expected main/middle/sub like 1/*/5')
+    result = []
+    for part, maximum in zip(parts, (MAX_MAIN_GROUP, MAX_MIDDLE_GROUP, MAX_SUB_GROUP)):
+        part = part.strip()
+        if part == WILDCARD:
+            result.append(None)
+        elif part.isdigit() and int(part) <= maximum:
+            result.append(int(part))
+        else:
+            raise ValueError(f'Invalid group address pattern [{pattern}]: [{part}] is not {WILDCARD} or 0-{maximum}')
+    return tuple(result)
+
+
+class QueryResult:
+    __slots__ = ('project', 'room', 'device', 'group_address')
+
+    def __init__(self, project: knx_objects.Project, room: knx_objects.Room, device: knx_objects.Device,
+                 group_address: knx_objects.GroupAddress):
+        self.project = project
+        self.room = room
+        self.device = device
+        self.group_address = group_address
+
+    def get_project(self) -> knx_objects.Project:
+        return self.project
+
+    def get_room(self) -> knx_objects.Room:
+        return self.room
+
+    def get_device(self) -> knx_objects.Device:
+        return self.device
+
+    def get_group_address(self) -> knx_objects.GroupAddress:
+        return self.group_address
+
+    def __repr__(self):
+        return (f'QueryResult({self.project.get_name()} / {self.room.get_name()} / {self.device.get_label()} / '
+                f'{self.group_address.get_address()})')
+
+
+class GroupAddressQuery:
+    def __init__(self, address: str = None, data_type: str = None, function: str = None, floor: str = None,
+                 device_type: str = None, project_id: int = None, project_name: str = None):
+        if address:
+            self.main_group, self.middle_group, self.sub_group = parse_address_pattern(address)
+        else:
+            self.main_group, self.middle_group, self.sub_group = None, None, None
+        self.data_type = data_type
+        self.function = function
+        self.floor = floor
+        self.device_type = device_type
+        self.project_id = project_id
+        self.project_name = project_name
+
+    def get_project_id(self) -> int:
+        return self.project_id
+
+    def get_project_name(self) -> str:
+        return self.project_name
+
+    def get_room_filters(self) -> dict:
+        return self.__get_filters({knx_objects.Room.FLOOR: self.floor})
+
+    def get_device_filters(self) -> dict:
+        return self.__get_filters({knx_objects.Device.DEVICE_TYPE: self.device_type})
+
+    def get_group_address_filters(self) -> dict:
+        return self.__get_filters({knx_objects.GroupAddress.MAIN_GROUP: self.main_group,
+                                   knx_objects.GroupAddress.MIDDLE_GROUP: self.middle_group,
+                                   knx_objects.GroupAddress.SUB_GROUP: self.sub_group,
+                                   knx_objects.GroupAddress.DATA_TYPE: self.data_type,
+                                   knx_objects.GroupAddress.FUNCTION: self.function})
+
+    def matches_project(self, project: knx_objects.Project) -> bool:
+        return ((self.project_id is None or project.get_project_id() == self.project_id)
+                and (self.project_name is None or project.get_name() == self.project_name))
+
+    def matches_room(self, room: knx_objects.Room) -> bool:
+        return self.floor is None or room.get_floor() == self.floor
+
+    def matches_device(self, device: knx_objects.Device) -> bool:
+        return self.device_type is None or device.get_device_type() == self.device_type
+
+    def matches_group_address(self, group_address: knx_objects.GroupAddress) -> bool:
+        return ((self.main_group is None or group_address.get_main_group() == self.main_group)
+                and (self.middle_group is None or group_address.get_middle_group() == self.middle_group)
+                and (self.sub_group is None or group_address.get_sub_group() == self.sub_group)
+                and (self.data_type is None or group_address.get_data_type() == self.data_type)
+                and (self.function is None or group_address.get_function() == self.function))
+
+    def matches(self, group_address: knx_objects.GroupAddress) -> bool:
+        if not self.matches_group_address(group_address):
+            return False
+        device = group_address.get_device()
+        if self.device_type is not None and (device is None or not self.matches_device(device)):
+            return False
+        room = device.get_room() if device is not None else None
+        if self.floor is not None and (room is None or not self.matches_room(room)):
+            return False
+        return True
+
+    def scan(self, projects: list):
+        # the same address is usually linked to several devices, so the tree is walked instead of a unique index
+        for project in projects:
+            if not self.matches_project(project):
+                continue
+            for room in project.get_rooms():
+                if not self.matches_room(room):
+                    continue
+                for device in room.get_devices():
+                    if not self.matches_device(device):
+                        continue
+                    for group_address in device.get_group_addresses():
+                        if self.matches_group_address(group_address):
+                            yield QueryResult(project, room, device, group_address)
+
+    @staticmethod
+    def __get_filters(filters: dict) -> dict:
+        return {key: value for key, value in filters.items() if value is not None}
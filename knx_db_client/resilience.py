@@ -0,0 +1,175 @@
+import contextlib
+import contextvars
+import functools
+import inspect
+import random
+import threading
+import time
+from http import HTTPStatus
+from knx_db_client.instrumentation import iter_in_context
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+RETRY_METHODS = ('GET', 'HEAD', 'DELETE')
+RETRY_STATUSES = (HTTPStatus.TOO_MANY_REQUESTS, HTTPStatus.BAD_GATEWAY, HTTPStatus.SERVICE_UNAVAILABLE,
+                  HTTPStatus.GATEWAY_TIMEOUT)
+
+current_deadline = contextvars.ContextVar('knx_db_client_deadline', default=None)
+
+
+class DeadlineExceeded(ValueError):
+    pass
+
+
+class CircuitOpenError(ValueError):
+    pass
+
+
+class Deadline:
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self.expires_at = time.monotonic() + timeout
+
+    def get_timeout(self) -> float:
+        return self.timeout
+
+    def get_expires_at(self) -> float:
+        return self.expires_at
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def is_expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def check(self, what: str) -> None:
+        if self.is_expired():
+            raise DeadlineExceeded(f'{what} exceeded its deadline of {self.timeout} s')
+
+
+@contextlib.contextmanager
+def deadline(timeout: float):
+    new_deadline = _get_nested_deadline(timeout)
+    token = current_deadline.set(new_deadline)
+    try:
+        yield new_deadline
+    finally:
+        current_deadline.reset(token)
+
+
+def get_request_timeout(timeout: float, what: str) -> float:
+    active_deadline = current_deadline.get()
+    if active_deadline is None:
+        return timeout
+    active_deadline.check(what)
+    return min(timeout, active_deadline.remaining())
+
+
+def with_deadline(method):
+    if inspect.isgeneratorfunction(method):
+        return _generator_with_deadline(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not self.operation_timeout:
+            return method(self, *args, **kwargs)
+        with deadline(self.operation_timeout):
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _generator_with_deadline(method):
+    # the deadline covers the whole life of the generator, time the caller spends between items included
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not self.operation_timeout:
+            yield from method(self, *args, **kwargs)
+            return
+        context = contextvars.copy_context()
+        context.run(current_deadline.set, _get_nested_deadline(self.operation_timeout))
+        yield from iter_in_context(context, method(self, *args, **kwargs))
+    return wrapper
+
+
+def _get_nested_deadline(timeout: float) -> Deadline:
+    new_deadline = Deadline(timeout)
+    outer_deadline = current_deadline.get()
+    if outer_deadline is not None and outer_deadline.get_expires_at() <= new_deadline.get_expires_at():
+        return outer_deadline
+    return new_deadline
+
+
+class RetryPolicy:
+    def __init__(self, max_attempts: int = 3, backoff: float = 0.1, max_backoff: float = 2.0,
+                 methods: tuple = RETRY_METHODS, statuses: tuple = RETRY_STATUSES):
+        if max_attempts < 1:
+            raise ValueError('Retry policy needs at least one attempt')
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.methods = frozenset(methods)
+        self.statuses = frozenset(statuses)
+
+    def get_max_attempts(self) -> int:
+        return self.max_attempts
+
+    def get_delay(self, attempt: int) -> float:
+        # full jitter: a random delay up to the capped exponential backoff spreads out synchronized retries
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def can_retry(self, method: str, attempt: int) -> bool:
+        return method in self.methods and attempt + 1 < self.max_attempts
+
+    def is_retryable_status(self, status_code: int) -> bool:
+        return status_code in self.statuses
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failure_count = 0
+        self.opened_at = None
+        self.trial_running = False
+        self.lock = threading.Lock()
+
+    def before_request(self) -> None:
+        with self.lock:
+            if self.state == OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    raise CircuitOpenError(f'Circuit open after {self.failure_count} consecutive failure(s), '
+                                           f'knx-db requests are failing fast')
+                self.state = HALF_OPEN
+                self.trial_running = False
+            if self.state == HALF_OPEN:
+                if self.trial_running:
+                    raise CircuitOpenError('Circuit half-open, waiting for the trial request to finish')
+                self.trial_running = True
+
+    def record_success(self) -> None:
+        with self.lock:
+            self.state = CLOSED
+            self.failure_count = 0
+            self.trial_running = False
+
+    def record_failure(self) -> None:
+        with self.lock:
+            self.failure_count += 1
+            self.trial_running = False
+            if self.state == HALF_OPEN or self.failure_count >= self.failure_threshold:
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+    def get_state(self) -> str:
+        with self.lock:
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                return HALF_OPEN
+            return self.state
+
+    def get_failure_count(self) -> int:
+        return self.failure_count
+
+    def reset(self) -> None:
+        self.record_success()
@@ -0,0 +1,131 @@
+import threading
+import time
+from collections import OrderedDict
+
+MAX_ENTRIES = 1024
+TTL = 30.0
+HEADER_ETAG = 'ETag'
+HEADER_LAST_MODIFIED = 'Last-Modified'
+HEADER_IF_NONE_MATCH = 'If-None-Match'
+HEADER_IF_MODIFIED_SINCE = 'If-Modified-Since'
+
+
+class CacheEntry:
+    def __init__(self, response, stored_at: float):
+        self.response = response
+        self.stored_at = stored_at
+
+    def get_response(self):
+        return self.response
+
+    def get_stored_at(self) -> float:
+        return self.stored_at
+
+    def set_stored_at(self, stored_at: float):
+        self.stored_at = stored_at
+
+    def get_validators(self) -> dict:
+        result = {}
+        if self.response.headers.get(HEADER_ETAG) is not None:
+            result[HEADER_IF_NONE_MATCH] = self.response.headers[HEADER_ETAG]
+        if self.response.headers.get(HEADER_LAST_MODIFIED) is not None:
+            result[HEADER_IF_MODIFIED_SINCE] = self.response.headers[HEADER_LAST_MODIFIED]
+        return result
+
+
+class ResponseCache:
+    def __init__(self, max_entries: int = None, ttl: float = None, resource_ttls: dict = None):
+        if max_entries:
+            self.max_entries = max_entries
+        else:
+            self.max_entries = MAX_ENTRIES
+        if ttl is not None:
+            self.ttl = ttl
+        else:
+            self.ttl = TTL
+        if resource_ttls:
+            self.resource_ttls = resource_ttls
+        else:
+            self.resource_ttls = {}
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+
+    def get(self, path: str):
+        with self.lock:
+            entry = self.entries.get(path)
+            if entry is None:
+                return None
+            self.entries.move_to_end(path)
+            return entry
+
+    def is_fresh(self, path: str, entry: CacheEntry) -> bool:
+        return time.monotonic() - entry.get_stored_at() < self.get_ttl(path)
+
+    def put(self, path: str, response):
+        with self.lock:
+            self.entries[path] = CacheEntry(response, time.monotonic())
+            self.entries.move_to_end(path)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def refresh(self, path: str, entry: CacheEntry):
+        with self.lock:
+            entry.set_stored_at(time.monotonic())
+            self.revalidations += 1
+
+    def record_hit(self):
+        with self.lock:
+            self.hits += 1
+
+    def record_miss(self):
+        with self.lock:
+            self.misses += 1
+
+    def invalidate(self, method: str, path: str):
+        if method == 'POST':
+            collection = path
+        else:
+            collection = path.rsplit('/', 1)[0]
+        with self.lock:
+            for key in list(self.entries):
+                resource = key.split('?', 1)[0]
+                if resource == collection or resource == path or resource.startswith(path + '/'):
+                    del self.entries[key]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def get_ttl(self, path: str) -> float:
+        return self.resource_ttls.get(self.get_resource(path), self.ttl)
+
+    @staticmethod
+    def get_resource(path: str) -> str:
+        segments = path.split('?', 1)[0].strip('/').split('/')
+        if len(segments) % 2 == 0:
+            return segments[-2]
+        return segments[-1]
+
+    def get_hits(self) -> int:
+        return self.hits
+
+    def get_misses(self) -> int:
+        return self.misses
+
+    def get_revalidations(self) -> int:
+        return self.revalidations
+
+    def get_evictions(self) -> int:
+        return self.evictions
+
+    def get_size(self) -> int:
+        return len(self.entries)
+
+    def get_stats(self) -> dict:
+        return {'hits': self.hits, 'misses': self.misses, 'revalidations': self.revalidations,
+                'evictions': self.evictions, 'size': len(self.entries)}
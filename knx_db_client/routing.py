@@ -0,0 +1,137 @@
+import itertools
+import logging
+import threading
+import time
+
+BASE_PATH = '/knx-db'
+PRIMARY = 'primary'
+REPLICA = 'replica'
+LEAST_OUTSTANDING = 'least-outstanding'
+ROUND_ROBIN = 'round-robin'
+READ_METHODS = ('GET', 'HEAD')
+EWMA_WEIGHT = 0.2
+MIN_SAMPLES = 5
+MAX_ERROR_RATE = 0.5
+EJECTION_TIME = 30.0
+
+logger = logging.getLogger(__name__)
+
+
+class Endpoint:
+    def __init__(self, host: str, port: int, base_path: str = None, role: str = PRIMARY):
+        self.host = host
+        self.port = port
+        if base_path:
+            self.base_path = base_path
+        else:
+            self.base_path = BASE_PATH
+        if role not in (PRIMARY, REPLICA):
+            raise ValueError(f'Unknown endpoint role [{role}], expected {PRIMARY} or {REPLICA}')
+        self.role = role
+        self.url_start = f'http://{self.host}:{self.port}{self.base_path}'
+        self.outstanding = 0
+        self.samples = 0
+        self.latency = 0.0
+        self.error_rate = 0.0
+        self.ejected_until = None
+        self.lock = threading.Lock()
+
+    def get_url_start(self) -> str:
+        return self.url_start
+
+    def get_role(self) -> str:
+        return self.role
+
+    def get_outstanding(self) -> int:
+        return self.outstanding
+
+    def get_latency(self) -> float:
+        return self.latency
+
+    def get_error_rate(self) -> float:
+        return self.error_rate
+
+    def is_ejected(self) -> bool:
+        with self.lock:
+            return self.__is_ejected(time.monotonic())
+
+    def begin(self) -> None:
+        with self.lock:
+            self.outstanding += 1
+
+    def end(self, duration: float, failed: bool) -> None:
+        with self.lock:
+            self.outstanding -= 1
+            if self.samples == 0:
+                self.latency = duration
+                self.error_rate = 1.0 if failed else 0.0
+            else:
+                self.latency += EWMA_WEIGHT * (duration - self.latency)
+                self.error_rate += EWMA_WEIGHT * ((1.0 if failed else 0.0) - self.error_rate)
+            self.samples += 1
+
+    def eject(self, duration: float) -> None:
+        with self.lock:
+            self.ejected_until = time.monotonic() + duration
+
+    def __is_ejected(self, now: float) -> bool:
+        if self.ejected_until is None:
+            return False
+        if now < self.ejected_until:
+            return True
+        # the ejection is over, the endpoint gets a fresh start instead of being judged on stale numbers
+        self.ejected_until = None
+        self.samples = 0
+        self.latency = 0.0
+        self.error_rate = 0.0
+        return False
+
+    def __repr__(self):
+        return f'Endpoint({self.url_start}, {self.role})'
+
+
+class EndpointRouter:
+    def __init__(self, endpoints: list, balancing: str = LEAST_OUTSTANDING, max_error_rate: float = MAX_ERROR_RATE,
+                 max_latency: float = None, ejection_time: float = EJECTION_TIME):
+        if balancing not in (LEAST_OUTSTANDING, ROUND_ROBIN):
+            raise ValueError(f'Unknown balancing [{balancing}], expected {LEAST_OUTSTANDING} or {ROUND_ROBIN}')
+        self.endpoints = list(endpoints)
+        self.primaries = [endpoint for endpoint in self.endpoints if endpoint.get_role() == PRIMARY]
+        if not self.primaries:
+            raise ValueError('At least one primary endpoint is required for writes')
+        self.replicas = [endpoint for endpoint in self.endpoints if endpoint.get_role() == REPLICA]
+        self.balancing = balancing
+        self.max_error_rate = max_error_rate
+        self.max_latency = max_latency
+        self.ejection_time = ejection_time
+        self.counter = itertools.count()
+
+    def select(self, method: str) -> Endpoint:
+        if method not in READ_METHODS:
+            return self.__choose(self.primaries)
+        return self.__choose(self.replicas or self.primaries)
+
+    def record(self, endpoint: Endpoint, duration: float, failed: bool) -> None:
+        endpoint.end(duration, failed)
+        if endpoint.samples < MIN_SAMPLES or endpoint.is_ejected():
+            return
+        too_slow = self.max_latency is not None and endpoint.get_latency() > self.max_latency
+        if endpoint.get_error_rate() > self.max_error_rate or too_slow:
+            logger.warning(f'Ejecting {endpoint} for {self.ejection_time} s: error rate '
+                           f'{endpoint.get_error_rate():.2f}, latency {endpoint.get_latency() * 1000:.1f} ms')
+            endpoint.eject(self.ejection_time)
+
+    def get_endpoints(self) -> list:
+        return self.endpoints
+
+    def __choose(self, candidates: list) -> Endpoint:
+        healthy = [endpoint for endpoint in candidates if not endpoint.is_ejected()]
+        if not healthy:
+            # reads fall back to the primary, and with everything ejected the least bad endpoint is better than none
+            healthy = [endpoint for endpoint in self.primaries if not endpoint.is_ejected()] or candidates
+        if self.balancing == ROUND_ROBIN or len(healthy) == 1:
+            endpoint = healthy[next(self.counter) % len(healthy)]
+        else:
+            endpoint = min(healthy, key=lambda candidate: (candidate.get_outstanding(), candidate.get_latency()))
+        endpoint.begin()
+        return endpoint
@@ -0,0 +1,75 @@
+import asyncio
+import threading
+from knx_db_client.resilience import DeadlineExceeded
+
+
+class Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.shared = 0
+
+
+class SingleFlight:
+    def __init__(self):
+        self.calls = {}
+        self.shared_count = 0
+        self.lock = threading.Lock()
+
+    def do(self, key, function, timeout: float = None):
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = Call()
+                self.calls[key] = call
+            else:
+                call.shared += 1
+                self.shared_count += 1
+        if not leader:
+            if not call.done.wait(timeout):
+                raise DeadlineExceeded(f'Waiting for the in-flight request [{key}] exceeded its deadline')
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = function()
+            return call.result
+        except Exception as err:
+            call.error = err
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call.done.set()
+
+    def get_in_flight(self) -> int:
+        with self.lock:
+            return len(self.calls)
+
+    def get_shared_count(self) -> int:
+        return self.shared_count
+
+
+class AsyncSingleFlight:
+    def __init__(self):
+        self.calls = {}
+        self.shared_count = 0
+
+    async def do(self, key, coroutine_function):
+        task = self.calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(coroutine_function())
+            self.calls[key] = task
+            task.add_done_callback(lambda _: self.calls.pop(key, None))
+        else:
+            self.shared_count += 1
+        # shielded so that one cancelled caller does not cancel the request for everybody else
+        return await asyncio.shield(task)
+
+    def get_in_flight(self) -> int:
+        return len(self.calls)
+
+    def get_shared_count(self) -> int:
+        return self.shared_count
@@ -0,0 +1,177 @@
+import hashlib
+import struct
+from knx_db_client import knx_objects
+
+MAGIC = b'KNXDBSNP'
+VERSION = 1
+HEADER = struct.Struct('>8sHH')
+NODE_ID = struct.Struct('>q')
+ADDRESS = struct.Struct('>BBB')
+STRING_LENGTH = struct.Struct('>H')
+NO_ID = -1
+NO_STRING = 0xFFFF
+NO_FINGERPRINT = b''
+PROJECT_RECORD = b'P'
+ROOM_RECORD = b'R'
+DEVICE_RECORD = b'D'
+GROUP_ADDRESS_RECORD = b'G'
+
+
+def dump_project(project: knx_objects.Project, fingerprint: bytes = None) -> bytes:
+    body = _encode_tree(project)
+    # the fingerprint is server state supplied by the caller, see KnxDbClient.get_project_fingerprint
+    if fingerprint is None:
+        fingerprint = NO_FINGERPRINT
+    return HEADER.pack(MAGIC, VERSION, len(fingerprint)) + fingerprint + body
+
+
+def load_project(data: bytes, fingerprint: bytes = None) -> knx_objects.Project:
+    stored_fingerprint, offset = _read_header(data)
+    if fingerprint is not None and not stored_fingerprint:
+        raise ValueError('Snapshot has no fingerprint to check for staleness')
+    if fingerprint is not None and fingerprint != stored_fingerprint:
+        raise ValueError('Snapshot is stale: fingerprint does not match')
+    return _decode_tree(memoryview(data), offset)
+
+
+def save_snapshot(project: knx_objects.Project, path: str, fingerprint: bytes = None) -> None:
+    with open(path, 'wb') as snapshot_file:
+        snapshot_file.write(dump_project(project, fingerprint))
+
+
+def load_snapshot(path: str, fingerprint: bytes = None) -> knx_objects.Project:
+    with open(path, 'rb') as snapshot_file:
+        return load_project(snapshot_file.read(), fingerprint)
+
+
+def read_fingerprint(path: str) -> bytes:
+    with open(path, 'rb') as snapshot_file:
+        data = snapshot_file.read(HEADER.size + 0xFFFF)
+    return _read_header(data)[0]
+
+
+def content_hash(project: knx_objects.Project) -> bytes:
+    # hashes the local tree, it tells whether two trees are equal but not whether knx-db changed since
+    return hashlib.sha256(_encode_tree(project)).digest()
+
+
+def _read_header(data: bytes) -> tuple:
+    if len(data) < HEADER.size:
+        raise ValueError('Snapshot is truncated')
+    magic, version, fingerprint_length = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError('Not a knx-db snapshot')
+    if version != VERSION:
+        raise ValueError(f'Unsupported snapshot version [{version}]')
+    offset = HEADER.size + fingerprint_length
+    return bytes(data[HEADER.size:offset]), offset
+
+
+def _encode_tree(project: knx_objects.Project) -> bytes:
+    chunks = []
+    project_json = project.get_data()
+    chunks.append(PROJECT_RECORD)
+    chunks.append(_encode_id(project_json.get(knx_objects.Project.PROJECT_ID)))
+    chunks.append(_encode_string(project_json[knx_objects.Project.NAME]))
+    for room in project.get_rooms():
+        room_json = room.get_data()
+        chunks.append(ROOM_RECORD)
+        chunks.append(_encode_id(room_json.get(knx_objects.Room.ROOM_ID)))
+        chunks.append(_encode_string(room_json[knx_objects.Room.NAME]))
+        chunks.append(_encode_string(room_json[knx_objects.Room.LABEL]))
+        chunks.append(_encode_string(room_json.get(knx_objects.Room.FLOOR)))
+        for device in room.get_devices():
+            device_json = device.get_data()
+            chunks.append(DEVICE_RECORD)
+            chunks.append(_encode_id(device_json.get(knx_objects.Device.DEVICE_ID)))
+            chunks.append(_encode_string(device_json[knx_objects.Device.LABEL]))
+            chunks.append(_encode_string(device_json.get(knx_objects.Device.NAME_AFFIX)))
+            chunks.append(_encode_string(device_json[knx_objects.Device.DEVICE_TYPE]))
+            for address in device.get_group_addresses():
+                address_json = address.get_data()
+                chunks.append(GROUP_ADDRESS_RECORD)
+                chunks.append(_encode_id(address_json.get(knx_objects.GroupAddress.GROUP_ADDRESS_ID)))
+                chunks.append(ADDRESS.pack(address_json[knx_objects.GroupAddress.MAIN_GROUP],
+                                           address_json[knx_objects.GroupAddress.MIDDLE_GROUP],
+                                           address_json[knx_objects.GroupAddress.SUB_GROUP]))
+                chunks.append(_encode_string(address_json.get(knx_objects.GroupAddress.FUNCTION)))
+                chunks.append(_encode_string(address_json.get(knx_objects.GroupAddress.DATA_TYPE)))
+    return b''.join(chunks)
+
+
+def _decode_tree(data: memoryview, offset: int) -> knx_objects.Project:
+    project = None
+    room = None
+    device = None
+    while offset < len(data):
+        record = data[offset:offset + 1].tobytes()
+        offset += 1
+        node_id, offset = _decode_id(data, offset)
+        if record == PROJECT_RECORD:
+            name, offset = _decode_string(data, offset)
+            project = knx_objects.Project.project_decoder({knx_objects.Project.PROJECT_ID: node_id,
+                                                           knx_objects.Project.NAME: name})
+        elif record == ROOM_RECORD:
+            name, offset = _decode_string(data, offset)
+            label, offset = _decode_string(data, offset)
+            floor, offset = _decode_string(data, offset)
+            room = knx_objects.Room.room_decoder({knx_objects.Room.ROOM_ID: node_id, knx_objects.Room.NAME: name,
+                                                  knx_objects.Room.LABEL: label, knx_objects.Room.FLOOR: floor})
+            project.add_room(room)
+        elif record == DEVICE_RECORD:
+            label, offset = _decode_string(data, offset)
+            name_affix, offset = _decode_string(data, offset)
+            device_type, offset = _decode_string(data, offset)
+            device = knx_objects.Device.device_decoder({knx_objects.Device.DEVICE_ID: node_id,
+                                                        knx_objects.Device.LABEL: label,
+                                                        knx_objects.Device.NAME_AFFIX: name_affix,
+                                                        knx_objects.Device.DEVICE_TYPE: device_type})
+            room.add_device(device)
+        elif record == GROUP_ADDRESS_RECORD:
+            main_group, middle_group, sub_group = ADDRESS.unpack_from(data, offset)
+            offset += ADDRESS.size
+            function, offset = _decode_string(data, offset)
+            data_type, offset = _decode_string(data, offset)
+            address = knx_objects.GroupAddress.group_address_decoder({
+                knx_objects.GroupAddress.GROUP_ADDRESS_ID: node_id,
+                knx_objects.GroupAddress.MAIN_GROUP: main_group,
+                knx_objects.GroupAddress.MIDDLE_GROUP: middle_group,
+                knx_objects.GroupAddress.SUB_GROUP: sub_group,
+                knx_objects.GroupAddress.FUNCTION: function,
+                knx_objects.GroupAddress.DATA_TYPE: data_type})
+            device.add_group_address(address)
+        else:
+            raise ValueError(f'Corrupt snapshot: unknown record type {record!r}')
+    if project is None:
+        raise ValueError('Corrupt snapshot: no project record')
+    return project
+
+
+def _encode_id(node_id: int) -> bytes:
+    if node_id is None:
+        return NODE_ID.pack(NO_ID)
+    return NODE_ID.pack(node_id)
+
+
+def _decode_id(data: memoryview, offset: int) -> tuple:
+    node_id = NODE_ID.unpack_from(data, offset)[0]
+    if node_id == NO_ID:
+        node_id = None
+    return node_id, offset + NODE_ID.size
+
+
+def _encode_string(value: str) -> bytes:
+    if value is None:
+        return STRING_LENGTH.pack(NO_STRING)
+    encoded = value.encode('utf-8')
+    if len(encoded) >= NO_STRING:
+        raise ValueError('Unable to write snapshot: string value too long')
+    return STRING_LENGTH.pack(len(encoded)) + encoded
+
+
+def _decode_string(data: memoryview, offset: int) -> tuple:
+    length = STRING_LENGTH.unpack_from(data, offset)[0]
+    offset += STRING_LENGTH.size
+    if length == NO_STRING:
+        return None, offset
+    return str(data[offset:offset + length], 'utf-8'), offset + length
@@ -0,0 +1,124 @@
+from knx_db_client import knx_objects
+from knx_db_client.bulk_report import BulkReport
+
+CREATE = 'create'
+REPLACE = 'replace'
+DELETE = 'delete'
+ID_KEYS = {knx_objects.Project: knx_objects.Project.PROJECT_ID, knx_objects.Room: knx_objects.Room.ROOM_ID,
+           knx_objects.Device: knx_objects.Device.DEVICE_ID,
+           knx_objects.GroupAddress: knx_objects.GroupAddress.GROUP_ADDRESS_ID}
+
+
+def get_natural_key(node):
+    if isinstance(node, knx_objects.Device):
+        return node.get_label()
+    if isinstance(node, knx_objects.GroupAddress):
+        return node.get_main_group(), node.get_middle_group(), node.get_sub_group()
+    return node.get_name()
+
+
+def get_content(node) -> dict:
+    result = node.get_data()
+    result.pop(ID_KEYS[type(node)], None)
+    return result
+
+
+def set_node_id(node, node_id: int) -> None:
+    if isinstance(node, knx_objects.Project):
+        node.set_project_id(node_id)
+    elif isinstance(node, knx_objects.Room):
+        node.set_room_id(node_id)
+    elif isinstance(node, knx_objects.Device):
+        node.set_device_id(node_id)
+    else:
+        node.set_group_address_id(node_id)
+
+
+def describe_node(node) -> str:
+    if isinstance(node, knx_objects.Project):
+        return f'project [{node.get_name()}]'
+    if isinstance(node, knx_objects.Room):
+        return f'room [{node.get_name()}]'
+    if isinstance(node, knx_objects.Device):
+        return f'device [{node.get_label()}]'
+    return f'group address [{node.get_address()}]'
+
+
+def clear_node_ids(node) -> None:
+    # IDs stored in a snapshot belong to the project it was taken from, nodes about to be created must not send them
+    set_node_id(node, None)
+    if isinstance(node, knx_objects.Project):
+        children = node.get_rooms()
+    elif isinstance(node, knx_objects.Room):
+        children = node.get_devices()
+    elif isinstance(node, knx_objects.Device):
+        children = node.get_group_addresses()
+    else:
+        children = []
+    for child in children:
+        clear_node_ids(child)
+
+
+class SyncAction:
+    def __init__(self, action: str, node, server_node=None):
+        self.action = action
+        self.node = node
+        self.server_node = server_node
+
+    def get_action(self) -> str:
+        return self.action
+
+    def get_node(self):
+        return self.node
+
+    def get_server_node(self):
+        return self.server_node
+
+    def __str__(self):
+        return f'{self.action} {describe_node(self.node)}'
+
+
+class SyncPlan:
+    def __init__(self, local_project: knx_objects.Project, server_project: knx_objects.Project = None):
+        self.local_project = local_project
+        self.server_project = server_project
+        self.actions = []
+        self.matches = []
+        self.report = None
+
+    def add_action(self, action: str, node, server_node=None) -> None:
+        self.actions.append(SyncAction(action, node, server_node))
+
+    def add_match(self, node, server_node) -> None:
+        self.matches.append((node, server_node))
+
+    def get_local_project(self) -> knx_objects.Project:
+        return self.local_project
+
+    def get_server_project(self) -> knx_objects.Project:
+        return self.server_project
+
+    def get_actions(self) -> list:
+        return self.actions
+
+    def get_nodes(self, action: str, node_type: type = None) -> list:
+        return [sync_action.get_node() for sync_action in self.actions
+                if sync_action.get_action() == action
+                and (node_type is None or isinstance(sync_action.get_node(), node_type))]
+
+    def get_matches(self) -> list:
+        return self.matches
+
+    def is_empty(self) -> bool:
+        return len(self.actions) == 0
+
+    def set_report(self, report: BulkReport) -> None:
+        self.report = report
+
+    def get_report(self) -> BulkReport:
+        return self.report
+
+    def __str__(self):
+        if self.is_empty():
+            return f'{describe_node(self.local_project)} is in sync'
+        return '\n'.join(str(sync_action) for sync_action in self.actions)
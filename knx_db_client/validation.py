@@ -0,0 +1,85 @@
+from knx_db_client import knx_objects
+from knx_db_client.group_address_index import pack_group_address
+from knx_db_client.sync_plan import describe_node
+
+
+class ValidationIssue:
+    def __init__(self, node, message: str):
+        self.node = node
+        self.message = message
+
+    def get_node(self):
+        return self.node
+
+    def get_message(self) -> str:
+        return self.message
+
+    def __str__(self):
+        return f'{describe_node(self.node)}: {self.message}'
+
+
+class ValidationReport:
+    def __init__(self):
+        self.issues = []
+
+    def add_issue(self, node, message: str) -> None:
+        self.issues.append(ValidationIssue(node, message))
+
+    def get_issues(self) -> list:
+        return self.issues
+
+    def is_valid(self) -> bool:
+        return len(self.issues) == 0
+
+    def raise_for_issues(self) -> None:
+        if self.issues:
+            raise ValueError(f'Validation failed with {len(self.issues)} problem(s):\n{self}')
+
+    def __str__(self):
+        return '\n'.join(str(issue) for issue in self.issues)
+
+
+def validate_project(project: knx_objects.Project) -> ValidationReport:
+    if project is None:
+        raise ValueError('Project has no value!')
+    report = ValidationReport()
+    _require_text(report, project, 'name', project.get_name())
+    # unloaded subtrees live on the server only, validating them would trigger requests
+    if not project.is_loaded():
+        return report
+    addresses = {}
+    for room in project.get_rooms():
+        _require_text(report, room, 'name', room.get_name())
+        _require_text(report, room, 'label', room.get_label())
+        if not room.is_loaded():
+            continue
+        for device in room.get_devices():
+            _require_text(report, device, 'label', device.get_label())
+            _require_text(report, device, 'device type', device.get_device_type())
+            if not device.is_loaded():
+                continue
+            for group_address in device.get_group_addresses():
+                _check_group_address(report, group_address, addresses)
+    return report
+
+
+def _require_text(report: ValidationReport, node, field: str, value) -> None:
+    if not isinstance(value, str) or not value.strip():
+        report.add_issue(node, f'{field} is required')
+
+
+def _check_group_address(report: ValidationReport, group_address: knx_objects.GroupAddress, addresses: dict):
+    parts = (group_address.get_main_group(), group_address.get_middle_group(), group_address.get_sub_group())
+    if any(not isinstance(part, int) or isinstance(part, bool) for part in parts):
+        report.add_issue(group_address, 'main, middle and sub group must be integers')
+        return
+    try:
+        packed_address = pack_group_address(*parts)
+    except ValueError as err:
+        report.add_issue(group_address, str(err))
+        return
+    first = addresses.setdefault(packed_address, group_address)
+    if first is not group_address:
+        first_device = first.get_device()
+        owner = f' (first used by {describe_node(first_device)})' if first_device is not None else ''
+        report.add_issue(group_address, f'duplicate address{owner}')
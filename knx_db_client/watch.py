@@ -0,0 +1,233 @@
+import asyncio
+import contextvars
+import hashlib
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from knx_db_client import knx_objects
+from knx_db_client import json_decoding
+from knx_db_client.sync_plan import describe_node
+
+ADDED = 'added'
+REMOVED = 'removed'
+MODIFIED = 'modified'
+INTERVAL = 5.0
+MAX_WORKERS = 8
+# decoder and ID key of the children listed below a project, a room and a device
+LEVELS = ((knx_objects.Room.room_decoder, knx_objects.Room.ROOM_ID),
+          (knx_objects.Device.device_decoder, knx_objects.Device.DEVICE_ID),
+          (knx_objects.GroupAddress.group_address_decoder, knx_objects.GroupAddress.GROUP_ADDRESS_ID))
+
+logger = logging.getLogger(__name__)
+
+
+def _digest(content) -> str:
+    if not isinstance(content, bytes):
+        content = json.dumps(content, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    return hashlib.sha1(content).hexdigest()
+
+
+def _set_parent(node, parent) -> None:
+    if isinstance(node, knx_objects.Room):
+        node.set_project(parent)
+    elif isinstance(node, knx_objects.Device):
+        node.set_room(parent)
+    else:
+        node.set_device(parent)
+
+
+class ChangeEvent:
+    def __init__(self, kind: str, node, previous=None):
+        self.kind = kind
+        self.node = node
+        self.previous = previous
+
+    def get_kind(self) -> str:
+        return self.kind
+
+    def get_node(self):
+        return self.node
+
+    def get_previous(self):
+        return self.previous
+
+    def __str__(self):
+        return f'{self.kind} {describe_node(self.node)}'
+
+
+class WatchedNode:
+    def __init__(self, node, digest: str, children=None):
+        self.node = node
+        self.digest = digest
+        self.children = children
+
+
+class WatchedList:
+    def __init__(self, ids: tuple, parent, announce: bool):
+        self.ids = ids
+        self.parent = parent
+        self.announce = announce
+        self.etag = None
+        self.digest = None
+        self.entries = {}
+
+    def get_digest(self) -> str:
+        child_digests = ''.join(entry.digest + (entry.children.get_digest() if entry.children is not None else '')
+                                for entry in self.entries.values())
+        return _digest(f'{self.digest}{child_digests}'.encode('utf-8'))
+
+
+class ProjectWatcher:
+    def __init__(self, project: knx_objects.Project, fetch, interval: float = None, max_workers: int = None):
+        self.project = project
+        self.fetch = fetch
+        if interval:
+            self.interval = interval
+        else:
+            self.interval = INTERVAL
+        if max_workers:
+            self.max_workers = max_workers
+        else:
+            self.max_workers = MAX_WORKERS
+        self.root = WatchedList((project.get_project_id(),), project, False)
+        self.listeners = []
+        self.removed = False
+        self.poll_lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def __aiter__(self):
+        return self.__iter_events()
+
+    def add_listener(self, listener) -> None:
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener) -> None:
+        self.listeners.remove(listener)
+
+    def get_project(self) -> knx_objects.Project:
+        return self.project
+
+    def get_digest(self) -> str:
+        return self.root.get_digest()
+
+    def is_removed(self) -> bool:
+        return self.removed
+
+    def start(self) -> None:
+        if self.thread is not None:
+            raise ValueError('Project watcher is already running')
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self.__run, name=f'knx-db-watch-{self.project.get_project_id()}',
+                                       daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join()
+        self.thread = None
+
+    def poll(self) -> list:
+        with self.poll_lock:
+            if self.removed:
+                return []
+            events = []
+            pending = [self.root]
+            executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='knx-db-watch')
+            try:
+                # one fan-out per level, a list that did not change is neither decoded nor diffed
+                while pending:
+                    contexts = [contextvars.copy_context() for _ in pending]
+                    versions = list(executor.map(lambda context, watched: context.run(self.fetch, watched.ids,
+                                                                                      watched.etag),
+                                                 contexts, pending))
+                    children = []
+                    for watched, version in zip(pending, versions):
+                        if version is None and watched is self.root:
+                            self.removed = True
+                            events.append(ChangeEvent(REMOVED, self.project))
+                            break
+                        if version is not None:
+                            self.__update(watched, *version, events)
+                        children.extend(entry.children for entry in watched.entries.values()
+                                        if entry.children is not None)
+                    pending = children if not self.removed else []
+            finally:
+                executor.shutdown(cancel_futures=True)
+        for event in events:
+            self.__notify(event)
+        return events
+
+    def __update(self, watched: WatchedList, etag: str, content: bytes, events: list):
+        watched.etag = etag
+        if content is None:
+            return
+        digest = _digest(content)
+        if digest == watched.digest:
+            return
+        # the first fetch of a list is the baseline unless its parent appeared after the baseline
+        announce = watched.announce or watched.digest is not None
+        watched.digest = digest
+        decoder, id_key = LEVELS[len(watched.ids) - 1]
+        entries = {}
+        for item in json_decoding.loads(content):
+            item_id = item[id_key]
+            item_digest = _digest(item)
+            entry = watched.entries.get(item_id)
+            if entry is not None and entry.digest == item_digest:
+                entries[item_id] = entry
+                continue
+            node = decoder(item)
+            _set_parent(node, watched.parent)
+            if entry is None:
+                children = None
+                if len(watched.ids) < len(LEVELS):
+                    children = WatchedList(watched.ids + (item_id,), node, announce)
+                entry = WatchedNode(node, item_digest, children)
+                if announce:
+                    events.append(ChangeEvent(ADDED, node))
+            else:
+                events.append(ChangeEvent(MODIFIED, node, entry.node))
+                entry.node = node
+                entry.digest = item_digest
+                if entry.children is not None:
+                    entry.children.parent = node
+                    for child in entry.children.entries.values():
+                        _set_parent(child.node, node)
+            entries[item_id] = entry
+        for item_id, entry in watched.entries.items():
+            if item_id not in entries:
+                events.append(ChangeEvent(REMOVED, entry.node))
+        watched.entries = entries
+
+    def __notify(self, event: ChangeEvent):
+        for listener in self.listeners:
+            try:
+                listener(event)
+            except Exception as err:
+                logger.error(f'Watch listener failed on {event}: {err}')
+
+    def __run(self):
+        while not self.stopped.wait(self.interval):
+            try:
+                self.poll()
+            except (ValueError, OSError) as err:
+                logger.error(f'Watching project [{self.project.get_name()}] failed: {err}')
+            if self.removed:
+                return
+
+    async def __iter_events(self):
+        loop = asyncio.get_running_loop()
+        while not self.removed:
+            await asyncio.sleep(self.interval)
+            for event in await loop.run_in_executor(None, self.poll):
+                yield event
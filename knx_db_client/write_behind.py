@@ -0,0 +1,137 @@
+import contextvars
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from knx_db_client import knx_objects
+from knx_db_client.bulk_report import BulkReport, get_node_id
+from knx_db_client.sync_plan import describe_node
+
+logger = logging.getLogger(__name__)
+
+
+def get_parent(node):
+    if isinstance(node, knx_objects.Room):
+        return node.get_project()
+    if isinstance(node, knx_objects.Device):
+        return node.get_room()
+    if isinstance(node, knx_objects.GroupAddress):
+        return node.get_device()
+    return None
+
+
+def get_children(node) -> list:
+    if isinstance(node, knx_objects.Project):
+        return node.get_rooms()
+    if isinstance(node, knx_objects.Room):
+        return node.get_devices()
+    if isinstance(node, knx_objects.Device):
+        return node.get_group_addresses()
+    return []
+
+
+class WriteBehindQueue:
+    def __init__(self, create_node, max_workers: int):
+        self.create_node = create_node
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='knx-db-write-behind')
+        self.futures = {}
+        self.report = BulkReport()
+        self.closed = False
+        self.condition = threading.Condition()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def create_project(self, project: knx_objects.Project) -> Future:
+        return self.submit(project)
+
+    def create_room(self, room: knx_objects.Room) -> Future:
+        return self.submit(room)
+
+    def create_device(self, device: knx_objects.Device) -> Future:
+        return self.submit(device)
+
+    def create_group_address(self, address: knx_objects.GroupAddress) -> Future:
+        return self.submit(address)
+
+    def submit(self, node, with_children: bool = True) -> Future:
+        if node is None:
+            raise ValueError('Node has no value!')
+        parent = get_parent(node)
+        if not isinstance(node, knx_objects.Project) and parent is None:
+            raise ValueError(f'{describe_node(node)} has no parent')
+        with self.condition:
+            if self.closed:
+                raise ValueError('Write-behind queue is closed')
+            if id(node) in self.futures:
+                return self.futures[id(node)][1]
+            parent_future = self.futures[id(parent)][1] if parent is not None and id(parent) in self.futures else None
+            if parent_future is None and parent is not None and get_node_id(parent) is None:
+                raise ValueError(f'Parent of {describe_node(node)} has no ID and is not queued')
+            future = Future()
+            self.futures[id(node)] = (node, future)
+        context = contextvars.copy_context()
+        if parent_future is None:
+            self.__schedule(node, future, context)
+        else:
+            parent_future.add_done_callback(lambda done: self.__on_parent_done(done, node, future, context))
+        if with_children:
+            for child in list(get_children(node)):
+                if get_node_id(child) is None:
+                    self.submit(child)
+        return future
+
+    def flush(self, timeout: float = None) -> BulkReport:
+        with self.condition:
+            if not self.condition.wait_for(lambda: not self.futures, timeout):
+                raise ValueError(f'Write-behind flush timed out with {len(self.futures)} pending create(s)')
+            report = self.report
+            self.report = BulkReport()
+            return report
+
+    def close(self) -> BulkReport:
+        with self.condition:
+            self.closed = True
+        report = self.flush()
+        self.executor.shutdown()
+        return report
+
+    def get_pending(self) -> int:
+        with self.condition:
+            return len(self.futures)
+
+    def __schedule(self, node, future: Future, context: contextvars.Context):
+        if not future.set_running_or_notify_cancel():
+            self.__finish(node)
+            return
+        self.executor.submit(context.run, self.__create, node, future)
+
+    def __on_parent_done(self, parent_future: Future, node, future: Future, context: contextvars.Context):
+        if parent_future.cancelled() or parent_future.exception() is not None:
+            error = ValueError(f'Skipped {describe_node(node)}: parent was not created')
+            self.report.add_failure(node, str(error))
+            self.__finish(node)
+            if not future.cancelled():
+                future.set_exception(error)
+            return
+        self.__schedule(node, future, context)
+
+    def __create(self, node, future: Future):
+        try:
+            self.create_node(node)
+        except Exception as err:
+            logger.error(f'Creating {describe_node(node)} failed: {err}')
+            self.report.add_failure(node, str(err))
+            self.__finish(node)
+            future.set_exception(err)
+            return
+        self.report.add_success(node)
+        self.__finish(node)
+        future.set_result(node)
+
+    def __finish(self, node):
+        with self.condition:
+            del self.futures[id(node)]
+            self.condition.notify_all()
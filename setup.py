@@ -4,6 +4,14 @@ setup(
     name='knxdbclient',
     version='1.0.0',
     packages=['knx_db_client'],
+    entry_points={
+        'console_scripts': ['knx-db=knx_db_client.cli:main']
+    },
+    extras_require={
+        'async': ['aiohttp'],
+        'fast-json': ['orjson', 'ijson'],
+        'columnar': ['pyarrow']
+    },
     author='Thomas Salm',
     author_email='knx-db-client@devtom.de',
     description='Client for knx-db'